@@ -10,12 +10,19 @@ Based on: carla.md Section 6.3 and 7.1-7.2
 
 import json
 import random
+from random import gauss as _gauss, random as _rand, uniform as _uniform
 import uuid
 import hashlib
 import os
 from collections import defaultdict
 from typing import List, Dict, Any
 
+try:
+    import h3
+    HAS_H3 = True
+except ImportError:
+    HAS_H3 = False
+
 # Configuration
 GROUND_TRUTH_PATH = "/workspace/godview_demo/logs/ground_truth.ndjson"
 RAW_BROKEN_PATH = "/workspace/godview_demo/logs/raw_broken.ndjson"
@@ -33,6 +40,11 @@ GHOST_OFFSET_METERS = 2.5  # Position offset for ghost
 SYBIL_INJECTION_FRAMES = [100, 200, 300, 400, 500]  # When to inject fake obstacles
 SYBIL_POSITION = {"x": 50.0, "y": -25.0, "z": 0.0}  # Fixed fake obstacle position
 
+# Consensus merge cells (ghosts landing in/next to a canonical's cell are merged)
+H3_RESOLUTION = 12  # ~9m hexagon edge
+GRID_CELL_METERS = 9.0  # Square-cell fallback when h3 is not installed
+METERS_PER_DEGREE = 111320.0
+
 
 def generate_uuid():
     """Generate a deterministic-looking UUID."""
@@ -41,7 +53,7 @@ def generate_uuid():
 
 def generate_fake_signature():
     """Generate a fake Ed25519 signature (invalid for demo)."""
-    return "INVALID_" + hashlib.sha256(str(random.random()).encode()).hexdigest()[:32]
+    return "INVALID_" + hashlib.sha256(str(_rand()).encode()).hexdigest()[:32]
 
 
 def generate_valid_signature(data: dict) -> str:
@@ -50,6 +62,33 @@ def generate_valid_signature(data: dict) -> str:
     return "Ed25519_" + hashlib.sha256(payload.encode()).hexdigest()[:48]
 
 
+def consensus_cell(x: float, y: float):
+    """Map a CARLA world position (meters) to a consensus merge cell id."""
+    if HAS_H3:
+        # CARLA maps without a geo-reference sit at lat/lng (0, 0), +y south
+        return h3.latlng_to_cell(-y / METERS_PER_DEGREE, x / METERS_PER_DEGREE, H3_RESOLUTION)
+    return (int(x // GRID_CELL_METERS), int(y // GRID_CELL_METERS))
+
+
+def neighbor_cells(cell) -> list:
+    """Return the cell plus its immediate ring of neighbours."""
+    if HAS_H3:
+        return h3.grid_disk(cell, 1)
+    cx, cy = cell
+    return [(cx + dx, cy + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+def nearest_canonical(consensus: Dict, x: float, y: float):
+    """Return the entity id of the closest canonical detection around (x, y)."""
+    best_id, best_d2 = None, float("inf")
+    for c in neighbor_cells(consensus_cell(x, y)):
+        for entity_id, cx, cy in consensus.get(c, ()):
+            d2 = (cx - x) ** 2 + (cy - y) ** 2
+            if d2 < best_d2:
+                best_id, best_d2 = entity_id, d2
+    return best_id
+
+
 def load_ground_truth() -> List[Dict]:
     """Load ground truth NDJSON."""
     print(f"Loading ground truth from: {GROUND_TRUTH_PATH}")
@@ -68,7 +107,7 @@ def inject_oosm_delays(packets: List[Dict], affected_actors: set) -> List[Dict]:
     for p in packets:
         modified = p.copy()
         if p["actor_id"] in affected_actors:
-            delay = random.gauss((OOSM_DELAY_MIN + OOSM_DELAY_MAX) / 2, 0.3)
+            delay = _gauss((OOSM_DELAY_MIN + OOSM_DELAY_MAX) / 2, 0.3)
             delay = max(OOSM_DELAY_MIN, min(OOSM_DELAY_MAX, delay))
             modified["timestamp"] = p["timestamp"] + delay
             modified["oosm_injected"] = True
@@ -99,8 +138,8 @@ def inject_ghosts(packets: List[Dict], ghost_actors: set) -> List[Dict]:
             ghost["entity_id"] = generate_uuid()  # New UUID
             ghost["original_actor_id"] = p["actor_id"]
             ghost["position"] = {
-                "x": p["position"]["x"] + random.gauss(GHOST_OFFSET_METERS, 0.5),
-                "y": p["position"]["y"] + random.gauss(GHOST_OFFSET_METERS, 0.5),
+                "x": p["position"]["x"] + _gauss(GHOST_OFFSET_METERS, 0.5),
+                "y": p["position"]["y"] + _gauss(GHOST_OFFSET_METERS, 0.5),
                 "z": p["position"]["z"]
             }
             ghost["ghost_injected"] = True
@@ -165,7 +204,7 @@ def generate_raw_broken_stream(packets: List[Dict]) -> List[Dict]:
             "velocity": [p["velocity"]["x"], p["velocity"]["y"], p["velocity"]["z"]],
             "class_id": 4 if p.get("is_drone") else (2 if p["actor_type"] == "pedestrian" else 1),
             "timestamp": p["timestamp"],
-            "confidence_score": random.uniform(0.7, 0.95),
+            "confidence_score": _uniform(0.7, 0.95),
             "frame": p["frame"],
             # Fault markers (for visualization)
             "faults": {
@@ -198,7 +237,7 @@ def generate_godview_merged_stream(raw_packets: List[Dict], ground_truth: List[D
     for p in ground_truth:
         gt_by_frame[p["frame"]][p["actor_id"]] = p
     
-    ghost_merges = {}  # Track ghost -> canonical mappings
+    ghost_merges = 0
     rejected_sybils = 0
     resequenced_oosm = 0
     z_corrections = 0
@@ -207,6 +246,14 @@ def generate_godview_merged_stream(raw_packets: List[Dict], ground_truth: List[D
         frame_packets = by_frame[frame]
         gt_frame = gt_by_frame.get(frame, {})
         
+        # Index this frame's canonical detections by cell so ghost lookups stay local
+        consensus = defaultdict(list)
+        for p in frame_packets:
+            faults = p.get("faults", {})
+            if not (faults.get("ghost", False) or faults.get("sybil", False)):
+                x, y = p["position"][0], p["position"][1]
+                consensus[consensus_cell(x, y)].append((p["entity_id"], x, y))
+        
         for p in frame_packets:
             # 1. TRUST: Reject Sybil attacks (invalid signatures)
             if p.get("faults", {}).get("sybil", False):
@@ -226,27 +273,24 @@ def generate_godview_merged_stream(raw_packets: List[Dict], ground_truth: List[D
             
             # 2. IDENTITY: Merge ghost duplicates (Highlander principle)
             if p.get("faults", {}).get("ghost", False):
-                # Find canonical ID from ground truth
-                entity_parts = p["entity_id"].split("_")
-                if "actor" in entity_parts:
+                # Resolve to the nearest canonical detection in the ghost's cell ring
+                canonical_id = nearest_canonical(consensus, p["position"][0], p["position"][1])
+                if canonical_id is None:
                     canonical_id = p["entity_id"]
-                else:
-                    canonical_id = f"actor_{p.get('original_actor_id', p['entity_id'])}"
                 
-                if p["entity_id"] not in ghost_merges:
-                    ghost_merges[p["entity_id"]] = canonical_id
-                    merge_events.append({
-                        "packet_type": "MERGE_EVENT",
-                        "timestamp": p["timestamp"],
-                        "event_code": "ID_MERGE",
-                        "frame": frame,
-                        "details": {
-                            "incoming_id": p["entity_id"],
-                            "canonical_id": canonical_id,
-                            "method": "HIGHLANDER_MIN_UUID",
-                            "confidence_boost": 0.12
-                        }
-                    })
+                ghost_merges += 1
+                merge_events.append({
+                    "packet_type": "MERGE_EVENT",
+                    "timestamp": p["timestamp"],
+                    "event_code": "ID_MERGE",
+                    "frame": frame,
+                    "details": {
+                        "incoming_id": p["entity_id"],
+                        "canonical_id": canonical_id,
+                        "method": "HIGHLANDER_MIN_UUID",
+                        "confidence_boost": 0.12
+                    }
+                })
                 continue  # Skip ghost, keep only canonical
             
             # 3. TIME: Fix OOSM by sorting (simulates AugmentedStateFilter replay)
@@ -295,7 +339,7 @@ def generate_godview_merged_stream(raw_packets: List[Dict], ground_truth: List[D
     merged.sort(key=lambda x: (x["frame"], x["timestamp"]))
     
     print(f"  Sybil attacks rejected: {rejected_sybils}")
-    print(f"  Ghost merges: {len(ghost_merges)}")
+    print(f"  Ghost merges: {ghost_merges}")
     print(f"  OOSM resequenced: {resequenced_oosm}")
     print(f"  Z-height corrections: {z_corrections}")
     print(f"  Final merged packets: {len(merged)}")
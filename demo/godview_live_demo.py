@@ -22,10 +22,14 @@ import random
 import time
 import math
 import argparse
-import queue
+import bisect
+import functools
+import threading
+import collections
 from enum import Enum
-from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from typing import Deque, Dict, List, Sequence, Tuple, Optional
+
+from overlay_njit import HAS_NUMBA, draw_lines_batch, draw_rects_batch
 
 # ============================================================================
 # CONFIGURATION
@@ -36,11 +40,26 @@ VIDEO_WIDTH = 1920
 VIDEO_HEIGHT = 1080
 FPS = 20
 OUTPUT_FILE = "godview_demo.mp4"
+NVENC_PIPELINE = (
+    "appsrc ! videoconvert ! nvh264enc bitrate=8000 ! h264parse ! "
+    "mp4mux ! filesink location={output}"
+)
 
 # Actor counts
 NUM_VEHICLES = 15
 NUM_DRONES = 3
 
+# Projection (90 degree horizontal FOV)
+FOCAL_PX = VIDEO_WIDTH / (2 * math.tan(math.radians(90) / 2))
+CULL_DISTANCE = 250.0  # meters; actors farther than this are never drawn
+
+# Chase cam offset behind/above the hero (meters)
+CHASE_DISTANCE = 15.0
+CHASE_HEIGHT = 8.0
+
+# Camera frames in flight between the sensor callback and the renderer
+FRAME_RING_SIZE = 3
+
 # Colors (BGR for OpenCV)
 COLOR_RAW = (50, 50, 255)       # Red - chaos/broken
 COLOR_GODVIEW = (50, 255, 50)   # Green - consensus/fixed
@@ -50,10 +69,76 @@ COLOR_WHITE = (255, 255, 255)
 COLOR_BLACK = (0, 0, 0)
 COLOR_YELLOW = (0, 255, 255)
 
+# Body-traffic paint colors (hero is always blue)
+TRAFFIC_COLORS = ['255,255,255', '50,50,50', '200,0,0', '0,100,0']
+
+# HUD bar heights (pixels)
+HUD_TOP = 70
+HUD_BOTTOM = 50
+
 # Fault injection
 OOSM_RATE = 0.3
 GHOST_RATE = 0.15
 
+# Overlay labels rasterized once at startup: (text, color, font scale)
+PRERENDERED_LABELS = [
+    ("RAW", COLOR_RAW, 0.5),
+    ("GHOST", COLOR_GHOST, 0.5),
+    ("GV", COLOR_GODVIEW, 0.5),
+    ("DRONE Z=0!", COLOR_RAW, 0.5),
+    ("DRONE", COLOR_GODVIEW, 0.5),
+    ("SYBIL!", COLOR_SYBIL, 0.5),
+    ("REJECTED", COLOR_GODVIEW, 0.5),
+]
+
+
+@functools.lru_cache(maxsize=64)
+def render_label_tile(text: str, scale: float, color: Tuple[int, int, int],
+                      thickness: int = 1) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Rasterize a label once for repeated blitting (LRU-cached; read-only).
+    
+    Returns (premultiplied color uint16 HxWx3, inverse alpha uint16 HxWx1,
+    ascent), where ascent is the distance from the tile top to the baseline.
+    The text starts one pixel in from the tile's left edge.
+    """
+    (w, h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+    alpha = np.zeros((h + baseline + 2, w + 2), dtype=np.uint8)
+    cv2.putText(alpha, text, (1, h + 1), cv2.FONT_HERSHEY_SIMPLEX, scale,
+                255, thickness, cv2.LINE_AA)
+    
+    # Scale alpha to 0..256 so the blend is a shift instead of a divide
+    a = alpha.astype(np.uint16)[:, :, None]
+    a += a >> 7
+    premult = a * np.array(color, dtype=np.uint16)
+    inv_alpha = 256 - a
+    premult.flags.writeable = False
+    inv_alpha.flags.writeable = False
+    return premult, inv_alpha, h + 1
+
+
+def blit_label_tile(frame: np.ndarray, tile: Tuple[np.ndarray, np.ndarray, int],
+                    x: int, y: int, skip_under_hud: bool = True):
+    """Alpha-blend a label tile with its baseline-left corner at (x, y)."""
+    premult, inv_alpha, ascent = tile
+    th, tw = inv_alpha.shape[:2]
+    top = y - ascent
+    x -= 1
+    
+    # Scene labels fully under the HUD bars would be painted over anyway
+    if skip_under_hud and (top + th <= HUD_TOP or top >= VIDEO_HEIGHT - HUD_BOTTOM):
+        return
+    
+    x0, y0 = max(x, 0), max(top, 0)
+    x1, y1 = min(x + tw, frame.shape[1]), min(top + th, frame.shape[0])
+    if x0 >= x1 or y0 >= y1:
+        return
+    
+    ty, tx = y0 - top, x0 - x
+    roi = frame[y0:y1, x0:x1]
+    blended = roi * inv_alpha[ty:ty + y1 - y0, tx:tx + x1 - x0]
+    blended += premult[ty:ty + y1 - y0, tx:tx + x1 - x0]
+    roi[:] = blended >> 8
+
 
 class Phase(Enum):
     """Narrative phases with (start_time, end_time)"""
@@ -70,50 +155,122 @@ class Phase(Enum):
     @property
     def end(self):
         return self.value[1]
+    
+    @property
+    def mask(self):
+        """Single-bit flag for set tests against the *_PHASES masks."""
+        return _PHASE_MASKS[self]
+
+
+# Phase lookup tables: bisect over start times instead of scanning the enum
+_PHASE_ORDER = list(Phase)
+_PHASE_STARTS = [phase.start for phase in _PHASE_ORDER]
+_PHASE_MASKS = {phase: 1 << i for i, phase in enumerate(_PHASE_ORDER)}
 
+RAW_PHASES = Phase.CHAOS.mask | Phase.ACTIVATION.mask
+GODVIEW_PHASES = Phase.ACTIVATION.mask | Phase.SOLUTION.mask | Phase.DEEPDIVE.mask
+CHASE_PHASES = Phase.CHAOS.mask | Phase.ACTIVATION.mask | Phase.SOLUTION.mask
 
-@dataclass
-class ActorState:
-    """Tracks an actor's true and perceived positions"""
-    actor: carla.Actor
-    true_pos: carla.Location
-    raw_pos: carla.Location  # With faults
-    gv_pos: carla.Location   # Corrected
-    has_oosm: bool = False
-    has_ghost: bool = False
-    ghost_offset: Tuple[float, float] = (0, 0)
-    is_drone: bool = False
-    drone_height: float = 0
+# HUD text per phase: (title, title color, status template)
+HUD_TEXT = {
+    Phase.SETUP: ("MULTI-AGENT PERCEPTION GRID", COLOR_WHITE,
+                  "Agents: {} | Network: UNSTABLE"),
+    Phase.CHAOS: ("RAW SENSOR VIEW - NO FUSION", COLOR_RAW,
+                  "Status: CRITICAL | Ghosts: {} | Z-Axis: COLLAPSED"),
+    Phase.ACTIVATION: ("INITIALIZING GODVIEW CORE...", COLOR_YELLOW,
+                       "H3 Sharding: {} | Highlander: {}"),
+    Phase.SOLUTION: ("GODVIEW CONSENSUS ACTIVE", COLOR_GODVIEW,
+                     "Status: STABLE | Late Packets Fixed: {} | Trust: VERIFIED"),
+    Phase.DEEPDIVE: ("PERCEPTION GRID STABILIZED", COLOR_GODVIEW,
+                     "Precision: +400% | Malicious Packets Dropped: {} | Canonical State: CONVERGED"),
+}
 
 
 class GodViewVideoDemo:
     """Creates the LinkedIn demo video with OpenCV rendering."""
     
-    def __init__(self, client: carla.Client, world: carla.World):
+    def __init__(self, client: carla.Client, world: carla.World,
+                 use_opencl: bool = False):
         self.client = client
         self.world = world
         self.bp_lib = world.get_blueprint_library()
         
+        # Overlay/HUD drawing through cv2.UMat (OpenCL T-API) when available
+        self.use_opencl = use_opencl and cv2.ocl.haveOpenCL()
+        if use_opencl and not self.use_opencl:
+            print("[VIDEO] OpenCL not available, drawing on CPU")
+        cv2.ocl.setUseOpenCL(self.use_opencl)
+        
         # Actors
         self.vehicles: List[carla.Actor] = []
         self.drones: List[Tuple[carla.Actor, float]] = []  # (actor, height)
         self.hero_vehicle: Optional[carla.Actor] = None
         self.camera: Optional[carla.Actor] = None
-        
-        # Frame capture
-        self.frame_queue = queue.Queue()
+        self._cam_transform = carla.Transform()  # Reused for every camera move
+        
+        # Frame capture: the camera callback copies into a preallocated ring
+        # and the deque carries slot indices, so no frame buffers are
+        # allocated per tick. Single producer/consumer: deque append/popleft
+        # are atomic, the Event only signals arrival.
+        self.frame_deque: Deque[int] = collections.deque(maxlen=FRAME_RING_SIZE)
+        self._frame_ready = threading.Event()
         self.current_frame = None
+        self._frame_ring = [np.zeros((VIDEO_HEIGHT, VIDEO_WIDTH, 3), dtype=np.uint8)
+                            for _ in range(FRAME_RING_SIZE)]
+        self._ring_idx = 0
+        self._blank_frame = np.zeros((VIDEO_HEIGHT, VIDEO_WIDTH, 3), dtype=np.uint8)
         
         # Video output
         self.video_writer = None
         
-        # State tracking
-        self.actor_states: dict = {}
-        self.oosm_actors: set = set()
-        self.ghost_actors: dict = {}  # actor_id -> (offset_x, offset_y)
+        # State tracking (struct-of-arrays, one row per entry in self.vehicles)
+        self._vid_to_idx: Dict[int, int] = {}
+        self.veh_true_xyz = np.zeros((0, 3), dtype=np.float32)
+        self.veh_raw_xyz = np.zeros((0, 3), dtype=np.float32)    # With faults
+        self.veh_ghost_off = np.zeros((0, 2), dtype=np.float32)  # Ghost (dx, dy)
+        self.veh_ghost_xyz = np.zeros((0, 3), dtype=np.float32)
+        self.veh_has_ghost = np.zeros(0, dtype=bool)
+        self.veh_ghost_shown = np.zeros(0, dtype=bool)           # This frame
+        self.veh_has_oosm = np.zeros(0, dtype=bool)
+        self.veh_alive = np.zeros(0, dtype=bool)                 # From world snapshot
+        
+        # Drones: z is pre-baked to the hover height
+        self.drone_true_xyz = np.zeros((0, 3), dtype=np.float32)
+        self.drone_alive = np.zeros(0, dtype=bool)
+        
+        # Fault injection randomness (OOSM jitter is pre-drawn per run)
+        self._rng = np.random.default_rng()
+        self._jitter = np.zeros((0, 0, 2), dtype=np.float32)
+        self._ghost_roll = np.zeros((0, 0), dtype=np.float32)
+        self._ghost_pool = np.zeros((0, 0, 2), dtype=np.float32)
+        
+        # Overlay batches, flushed once per frame: (color, half-size) -> box
+        # centre arrays, (color, thickness) -> line segments, plus
+        # (text, x, y, color, scale) labels
+        self._overlay_rects: Dict[Tuple[Tuple[int, int, int], int], List[np.ndarray]] = {}
+        self._overlay_segments: Dict[Tuple[Tuple[int, int, int], int], List[Sequence[Sequence[int]]]] = {}
+        self._overlay_labels: List[Tuple[str, int, int, Tuple[int, int, int], float]] = []
+        for text, color, scale in PRERENDERED_LABELS:
+            render_label_tile(text, scale, color)  # Warm the tile cache
+        
+        # HUD strings are only reformatted when their inputs change, and each
+        # bar is composited once per distinct text and pasted every frame
+        self._hud_status_key: Optional[tuple] = None
+        self._hud_status = ""
+        self._hud_timer_key: Optional[int] = None
+        self._hud_timer = ""
+        self._hud_top_key: Optional[tuple] = None
+        self._hud_top = np.zeros((HUD_TOP + 2, VIDEO_WIDTH, 3), dtype=np.uint8)
+        self._hud_bottom_key: Optional[tuple] = None
+        self._hud_bottom = np.zeros((HUD_BOTTOM, VIDEO_WIDTH, 3), dtype=np.uint8)
+        
+        # Per-frame camera pose and projection axes
+        self._cam_cache: Dict[str, np.ndarray] = {}
+        self._cam_pose_key: Optional[tuple] = None
         
         # Sybil attack position (fake obstacle)
         self.sybil_pos = None
+        self._sybil_cache: Tuple[Optional[tuple], Optional[Tuple[int, int]]] = (None, None)
         
         # Statistics
         self.stats = {
@@ -126,6 +283,7 @@ class GodViewVideoDemo:
         
         # Timing
         self.frame_count = 0
+        self._raw_frames = 0  # Frames with fault injection applied
         self.start_time = 0
         
         # Traffic manager
@@ -182,8 +340,25 @@ class GodViewVideoDemo:
         # Convert to numpy array
         array = np.frombuffer(image.raw_data, dtype=np.uint8)
         array = array.reshape((VIDEO_HEIGHT, VIDEO_WIDTH, 4))  # BGRA
-        frame = array[:, :, :3]  # Drop alpha, keep BGR
-        self.frame_queue.put(frame.copy())
+        slot = self._ring_idx % FRAME_RING_SIZE
+        self._ring_idx += 1
+        np.copyto(self._frame_ring[slot], array[:, :, :3])  # Drop alpha, keep BGR
+        self.frame_deque.append(slot)
+        self._frame_ready.set()
+    
+    def _next_camera_slot(self, timeout: float = 1.0) -> Optional[int]:
+        """Pop the oldest delivered ring slot, waiting up to timeout for one."""
+        while True:
+            try:
+                return self.frame_deque.popleft()
+            except IndexError:
+                pass
+            
+            self._frame_ready.clear()
+            if self.frame_deque:  # Arrived between popleft and clear
+                continue
+            if not self._frame_ready.wait(timeout):
+                return None
     
     def spawn_actors(self):
         """Spawn vehicles and simulated drones."""
@@ -193,18 +368,22 @@ class GodViewVideoDemo:
         # Spawn vehicles
         vehicle_bps = [bp for bp in self.bp_lib.filter('vehicle.*') 
                        if int(bp.get_attribute('number_of_wheels')) == 4]
+        colorable = {bp.id for bp in vehicle_bps if bp.has_attribute('color')}
+        oosm_flags = []
+        
+        # Hero vehicle in distinctive color, configured once up front
+        hero_bp = random.choice([bp for bp in vehicle_bps if bp.id in colorable]
+                                or vehicle_bps)
+        if hero_bp.id in colorable:
+            hero_bp.set_attribute('color', '0,100,255')  # Blue hero
         
         for i, sp in enumerate(spawn_points[:NUM_VEHICLES]):
-            bp = random.choice(vehicle_bps)
-            
-            # Hero vehicle in distinctive color
-            if bp.has_attribute('color'):
-                if i == 0:
-                    bp.set_attribute('color', '0,100,255')  # Blue hero
-                else:
-                    bp.set_attribute('color', random.choice([
-                        '255,255,255', '50,50,50', '200,0,0', '0,100,0'
-                    ]))
+            if i == 0:
+                bp = hero_bp
+            else:
+                bp = random.choice(vehicle_bps)
+                if bp.id in colorable:
+                    bp.set_attribute('color', random.choice(TRAFFIC_COLORS))
             
             vehicle = self.world.try_spawn_actor(bp, sp)
             if vehicle:
@@ -219,13 +398,23 @@ class GodViewVideoDemo:
                 self.vehicles.append(vehicle)
                 
                 # Select some for OOSM
-                if random.random() < OOSM_RATE:
-                    self.oosm_actors.add(vehicle.id)
+                oosm_flags.append(random.random() < OOSM_RATE)
                 
                 if i == 0:
                     self.hero_vehicle = vehicle
         
-        print(f"[SPAWN] {len(self.vehicles)} vehicles ({len(self.oosm_actors)} with OOSM)")
+        num = len(self.vehicles)
+        self._vid_to_idx = {v.id: idx for idx, v in enumerate(self.vehicles)}
+        self.veh_true_xyz = np.zeros((num, 3), dtype=np.float32)
+        self.veh_raw_xyz = np.zeros((num, 3), dtype=np.float32)
+        self.veh_ghost_off = np.zeros((num, 2), dtype=np.float32)
+        self.veh_ghost_xyz = np.zeros((num, 3), dtype=np.float32)
+        self.veh_has_ghost = np.zeros(num, dtype=bool)
+        self.veh_ghost_shown = np.zeros(num, dtype=bool)
+        self.veh_has_oosm = np.array(oosm_flags, dtype=bool)
+        self.veh_alive = np.ones(num, dtype=bool)
+        
+        print(f"[SPAWN] {num} vehicles ({int(self.veh_has_oosm.sum())} with OOSM)")
         
         # Spawn "drones" (walkers at altitude)
         walker_bp = self.bp_lib.find('walker.pedestrian.0001')
@@ -238,6 +427,10 @@ class GodViewVideoDemo:
             if drone:
                 self.drones.append((drone, height))
         
+        self.drone_true_xyz = np.zeros((len(self.drones), 3), dtype=np.float32)
+        self.drone_true_xyz[:, 2] = [height for _, height in self.drones]
+        self.drone_alive = np.ones(len(self.drones), dtype=bool)
+        
         print(f"[SPAWN] {len(self.drones)} drones at altitude")
         
         # Set up Sybil attack position (fake barrier)
@@ -246,25 +439,44 @@ class GodViewVideoDemo:
             self.sybil_pos = (hero_loc.x + 8, hero_loc.y, hero_loc.z)
     
     def setup_video_writer(self):
-        """Initialize OpenCV VideoWriter for MP4 output."""
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        """Initialize OpenCV VideoWriter for MP4 output.
+
+        Prefers the NVENC hardware encoder through GStreamer so encoding
+        does not compete with CARLA and the overlay renderer for CPU time;
+        falls back to software mp4v when that pipeline cannot be opened.
+        """
+        size = (VIDEO_WIDTH, VIDEO_HEIGHT)
+        pipeline = NVENC_PIPELINE.format(output=OUTPUT_FILE)
         self.video_writer = cv2.VideoWriter(
-            OUTPUT_FILE, fourcc, FPS, (VIDEO_WIDTH, VIDEO_HEIGHT)
+            pipeline, cv2.CAP_GSTREAMER, 0, FPS, size, True
         )
-        print(f"[VIDEO] Writing to {OUTPUT_FILE}")
+        if self.video_writer.isOpened():
+            print(f"[VIDEO] Writing to {OUTPUT_FILE} (NVENC)")
+            return
+
+        self.video_writer.release()
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        self.video_writer = cv2.VideoWriter(OUTPUT_FILE, fourcc, FPS, size)
+        print(f"[VIDEO] Writing to {OUTPUT_FILE} (mp4v)")
     
     def get_current_phase(self, elapsed: float) -> Phase:
         """Determine narrative phase based on elapsed time."""
-        for phase in Phase:
-            if phase.start <= elapsed < phase.end:
-                return phase
-        return Phase.DEEPDIVE
+        # Phases are contiguous, so the last start <= elapsed wins; times
+        # before the first phase index -1, i.e. DEEPDIVE, as before
+        return _PHASE_ORDER[bisect.bisect_right(_PHASE_STARTS, elapsed) - 1]
     
     def get_phase_progress(self, elapsed: float, phase: Phase) -> float:
         """Get progress within current phase (0.0 to 1.0)."""
         duration = phase.end - phase.start
         return min(1.0, (elapsed - phase.start) / duration)
     
+    def _set_camera_pose(self, x: float, y: float, z: float, pitch: float, yaw: float):
+        """Move the camera by mutating the pooled transform in place."""
+        t = self._cam_transform
+        t.location.x, t.location.y, t.location.z = x, y, z
+        t.rotation.pitch, t.rotation.yaw = pitch, yaw
+        self.camera.set_transform(t)
+    
     def update_camera_for_phase(self, phase: Phase, progress: float):
         """Position camera based on current narrative phase."""
         if not self.camera:
@@ -281,196 +493,278 @@ class GodViewVideoDemo:
             x = math.cos(angle) * radius
             y = math.sin(angle) * radius
             
-            transform = carla.Transform(
-                carla.Location(x=x, y=y, z=z),
-                carla.Rotation(pitch=pitch, yaw=math.degrees(angle) + 180)
-            )
-            self.camera.set_transform(transform)
+            self._set_camera_pose(x, y, z, pitch, math.degrees(angle) + 180)
             
-        elif phase in [Phase.CHAOS, Phase.ACTIVATION, Phase.SOLUTION]:
+        elif phase.mask & CHASE_PHASES:
             # Chase cam behind hero
             if self.hero_vehicle and self.hero_vehicle.is_alive:
                 hero_t = self.hero_vehicle.get_transform()
+                hero_loc = hero_t.location
+                hero_yaw = hero_t.rotation.yaw
                 
-                # Behind and above hero
-                fwd = hero_t.get_forward_vector()
-                cam_loc = hero_t.location + carla.Location(
-                    x=-fwd.x * 15,
-                    y=-fwd.y * 15,
-                    z=8
+                # Behind and above hero (ground-plane heading from yaw)
+                yaw = math.radians(hero_yaw)
+                self._set_camera_pose(
+                    hero_loc.x - math.cos(yaw) * CHASE_DISTANCE,
+                    hero_loc.y - math.sin(yaw) * CHASE_DISTANCE,
+                    hero_loc.z + CHASE_HEIGHT,
+                    -15,
+                    hero_yaw
                 )
-                cam_rot = carla.Rotation(
-                    pitch=-15,
-                    yaw=hero_t.rotation.yaw
-                )
-                self.camera.set_transform(carla.Transform(cam_loc, cam_rot))
         
         elif phase == Phase.DEEPDIVE:
             # Wide establishing shot
-            transform = carla.Transform(
-                carla.Location(x=0, y=0, z=60),
-                carla.Rotation(pitch=-60, yaw=45)
-            )
-            self.camera.set_transform(transform)
-    
-    def inject_faults(self, actor: carla.Actor, true_loc: carla.Location, 
-                      is_drone: bool = False) -> Tuple[carla.Location, bool]:
-        """Inject faults for 'raw' perception. Returns (faulty_pos, has_ghost)."""
-        raw = carla.Location(true_loc.x, true_loc.y, true_loc.z)
-        has_ghost = False
-        
-        # OOSM jitter
-        if actor.id in self.oosm_actors:
-            jitter_x = random.gauss(0, 1.2)
-            jitter_y = random.gauss(0, 1.2)
-            raw.x += jitter_x
-            raw.y += jitter_y
-            self.stats["oosm_errors"] += 1
-        
-        # Pancake world for drones
-        if is_drone:
-            raw.z = 0.5  # Flatten to ground
-            self.stats["pancake_errors"] += 1
-        
-        # Ghost injection
-        if not is_drone and random.random() < GHOST_RATE:
-            if actor.id not in self.ghost_actors:
-                self.ghost_actors[actor.id] = (
-                    random.uniform(-3, 3),
-                    random.uniform(-3, 3)
-                )
-            has_ghost = True
-            self.stats["ghosts"] = len(self.ghost_actors)
-        
-        return raw, has_ghost
+            self._set_camera_pose(0, 0, 60, -60, 45)
     
-    def world_to_screen(self, location: carla.Location) -> Optional[Tuple[int, int]]:
-        """Project world location to screen coordinates."""
-        if not self.camera:
-            return None
-        
+    def update_true_positions(self):
+        """Refresh ground truth and liveness from a single world snapshot.
+        
+        Actors missing from the snapshot are treated as dead, so no per-actor
+        is_alive/get_location round trips are made.
+        """
+        snapshot = self.world.get_snapshot()
+        
+        for i, vehicle in enumerate(self.vehicles):
+            actor = snapshot.find(vehicle.id)
+            self.veh_alive[i] = actor is not None
+            if actor is not None:
+                loc = actor.get_transform().location
+                self.veh_true_xyz[i] = (loc.x, loc.y, loc.z)
+        
+        for i, (drone, _) in enumerate(self.drones):
+            actor = snapshot.find(drone.id)
+            self.drone_alive[i] = actor is not None
+            if actor is not None:
+                loc = actor.get_transform().location
+                self.drone_true_xyz[i, :2] = (loc.x, loc.y)  # z stays at altitude
+    
+    def compact_dead_actors(self):
+        """Drop dead vehicles/drones from the actor lists and every per-actor array."""
+        if not self.veh_alive.all():
+            keep = self.veh_alive.copy()
+            self.vehicles = [v for v, k in zip(self.vehicles, keep) if k]
+            self._vid_to_idx = {v.id: idx for idx, v in enumerate(self.vehicles)}
+            for name in ("veh_true_xyz", "veh_raw_xyz", "veh_ghost_off", "veh_ghost_xyz",
+                         "veh_has_ghost", "veh_ghost_shown", "veh_has_oosm", "veh_alive"):
+                setattr(self, name, getattr(self, name)[keep])
+            for name in ("_jitter", "_ghost_roll", "_ghost_pool"):
+                setattr(self, name, getattr(self, name)[:, keep])
+        
+        if not self.drone_alive.all():
+            keep = self.drone_alive.copy()
+            self.drones = [d for d, k in zip(self.drones, keep) if k]
+            self.drone_true_xyz = self.drone_true_xyz[keep]
+            self.drone_alive = self.drone_alive[keep]
+    
+    def _inject_faults_batch(self, frame_idx: int):
+        """Apply OOSM jitter and ghost injection to every vehicle at once."""
+        np.copyto(self.veh_raw_xyz, self.veh_true_xyz)
+        self.veh_raw_xyz[:, :2] += self._jitter[frame_idx] * self.veh_has_oosm[:, None]
+        self._raw_frames += 1
+        
+        # A vehicle keeps the offset of its first ghost; later rolls re-show it
+        np.less(self._ghost_roll[frame_idx], GHOST_RATE, out=self.veh_ghost_shown)
+        new_ghosts = self.veh_ghost_shown & ~self.veh_has_ghost
+        self.veh_ghost_off[new_ghosts] = self._ghost_pool[frame_idx, new_ghosts]
+        self.veh_has_ghost |= new_ghosts
+        
+        np.copyto(self.veh_ghost_xyz, self.veh_raw_xyz)
+        self.veh_ghost_xyz[:, :2] += self.veh_ghost_off
+    
+    def update_camera_cache(self):
+        """Read the camera pose once per frame and derive its projection axes."""
         cam_t = self.camera.get_transform()
         cam_loc = cam_t.location
         cam_rot = cam_t.rotation
-        
-        # Vector from camera to point
-        dx = location.x - cam_loc.x
-        dy = location.y - cam_loc.y
-        dz = location.z - cam_loc.z
-        
-        # Rotate to camera space
         yaw = math.radians(cam_rot.yaw)
         pitch = math.radians(cam_rot.pitch)
         
-        # Simple projection (approximate)
-        cos_yaw, sin_yaw = math.cos(-yaw), math.sin(-yaw)
-        cos_pitch, sin_pitch = math.cos(-pitch), math.sin(-pitch)
-        
-        # Rotate around Z (yaw)
-        x1 = dx * cos_yaw - dy * sin_yaw
-        y1 = dx * sin_yaw + dy * cos_yaw
-        z1 = dz
-        
-        # Rotate around Y (pitch)
-        x2 = x1 * cos_pitch + z1 * sin_pitch
-        z2 = -x1 * sin_pitch + z1 * cos_pitch
-        y2 = y1
-        
-        # Behind camera check
-        if x2 < 1:
+        # Pose quantized to 0.5 m / 1 degree, for caching static projections
+        self._cam_pose_key = (int(cam_loc.x * 2), int(cam_loc.y * 2), int(cam_loc.z * 2),
+                              int(cam_rot.yaw), int(cam_rot.pitch))
+        cy, sy = math.cos(yaw), math.sin(yaw)
+        cp, sp = math.cos(pitch), math.sin(pitch)
+        
+        # Fused (approximate) yaw-then-pitch rotation used for projection.
+        # Rows map a world delta to (depth, screen-x, screen-y) camera axes.
+        self._cam_cache = {
+            "loc": np.array([cam_loc.x, cam_loc.y, cam_loc.z], dtype=np.float32),
+            "R": np.array([
+                [cp * cy, cp * sy, -sp],
+                [-sy, cy, 0.0],
+                [sp * cy, sp * sy, cp],
+            ], dtype=np.float32),
+        }
+    
+    def project_points(self, xyz: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Project an (N, 3) array of world points to screen coordinates.
+        
+        All points are rotated into camera space with one matmul; points
+        behind the camera or beyond CULL_DISTANCE are culled before the
+        perspective divide.
+        Returns (screen int32 (N, 2), valid bool (N,)).
+        """
+        n = len(xyz)
+        screen = np.zeros((n, 2), dtype=np.int32)
+        if not self._cam_cache or n == 0:
+            return screen, np.zeros(n, dtype=bool)
+        
+        cache = self._cam_cache
+        delta = np.asarray(xyz, dtype=np.float32) - cache["loc"]
+        cam = delta @ cache["R"].T  # (depth, lateral, vertical) per point
+        depth = cam[:, 0]
+        valid = (depth >= 1.0) & (np.einsum('ij,ij->i', delta, delta) <= CULL_DISTANCE ** 2)
+        
+        idx = np.flatnonzero(valid)
+        if len(idx):
+            c = cam[idx]
+            inv_depth = FOCAL_PX / c[:, 0]
+            screen[idx, 0] = (VIDEO_WIDTH / 2 - c[:, 1] * inv_depth).astype(np.int32)
+            screen[idx, 1] = (VIDEO_HEIGHT / 2 - c[:, 2] * inv_depth).astype(np.int32)
+            valid &= ((screen[:, 0] >= 0) & (screen[:, 0] < VIDEO_WIDTH) &
+                      (screen[:, 1] >= 0) & (screen[:, 1] < VIDEO_HEIGHT))
+        return screen, valid
+    
+    def world_to_screen(self, location: Sequence[float]) -> Optional[Tuple[int, int]]:
+        """Project world (x, y, z) to screen coordinates."""
+        screen, valid = self.project_points(np.asarray([location], dtype=np.float32))
+        if not valid[0]:
             return None
-        
-        # Project to screen
-        fov = 90
-        f = VIDEO_WIDTH / (2 * math.tan(math.radians(fov) / 2))
-        
-        screen_x = int(VIDEO_WIDTH / 2 - (y2 / x2) * f)
-        screen_y = int(VIDEO_HEIGHT / 2 - (z2 / x2) * f)
-        
-        # Bounds check
-        if 0 <= screen_x < VIDEO_WIDTH and 0 <= screen_y < VIDEO_HEIGHT:
-            return (screen_x, screen_y)
-        return None
+        return (int(screen[0, 0]), int(screen[0, 1]))
     
-    def draw_box(self, frame: np.ndarray, pos: carla.Location, 
-                 color: Tuple[int, int, int], label: str = "",
-                 size: int = 40):
-        """Draw a bounding box on the frame."""
-        screen_pos = self.world_to_screen(pos)
-        if not screen_pos:
+    def queue_boxes(self, centers: np.ndarray, color: Tuple[int, int, int],
+                    label: str = "", size: int = 40):
+        """Queue square boxes (and one label each) centred on screen positions."""
+        if len(centers) == 0:
             return
-        
-        x, y = screen_pos
         half = size // 2
+        self._overlay_rects.setdefault((color, half), []).append(centers)
         
-        # Draw box
-        cv2.rectangle(frame, (x - half, y - half), (x + half, y + half), color, 2)
-        
-        # Draw label
         if label:
-            cv2.putText(frame, label, (x - half, y - half - 5),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
+            for x, y in centers:
+                self._overlay_labels.append((label, x - half, y - half - 5, color, 0.5))
     
-    def draw_drone_stem(self, frame: np.ndarray, pos: carla.Location, 
-                        height: float, color: Tuple[int, int, int]):
-        """Draw a vertical stem from ground to drone."""
-        ground_pos = carla.Location(pos.x, pos.y, 0.1)
-        
-        top = self.world_to_screen(pos)
-        bottom = self.world_to_screen(ground_pos)
-        
-        if top and bottom:
-            cv2.line(frame, bottom, top, color, 2)
-            cv2.putText(frame, f"Z:{height:.0f}m", (top[0] + 5, top[1]),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1, cv2.LINE_AA)
+    def queue_segment(self, p0: Sequence[int], p1: Sequence[int],
+                      color: Tuple[int, int, int], thickness: int = 2):
+        """Queue a straight line segment between two screen positions."""
+        self._overlay_segments.setdefault((color, thickness), []).append((p0, p1))
+    
+    def queue_drone_stem(self, top: Sequence[int], bottom: Sequence[int],
+                         height: float, color: Tuple[int, int, int]):
+        """Queue a vertical stem from ground to drone (screen positions)."""
+        self.queue_segment(bottom, top, color, 2)
+        self._overlay_labels.append((f"Z:{height:.0f}m", top[0] + 5, top[1], color, 0.4))
+    
+    def draw_queued_shapes(self, canvas):
+        """Draw queued boxes/segments with one call per color batch.
+        
+        Host frames use the Numba kernels from overlay_njit when available;
+        otherwise (and always for cv2.UMat) one cv2.polylines call is made.
+        """
+        use_njit = HAS_NUMBA and isinstance(canvas, np.ndarray)
+        
+        for (color, half), batches in self._overlay_rects.items():
+            centers = np.concatenate(batches).astype(np.int32, copy=False)
+            if use_njit:
+                draw_rects_batch(canvas, centers, half, np.array(color, dtype=np.uint8), 2)
+            else:
+                corners = centers[:, None, :] + np.array(
+                    [[-half, -half], [half, -half], [half, half], [-half, half]],
+                    dtype=np.int32)
+                cv2.polylines(canvas, list(corners), True, color, 2)
+        self._overlay_rects.clear()
+        
+        for (color, thickness), segments in self._overlay_segments.items():
+            segs = np.array(segments, dtype=np.int32)  # (M, 2 endpoints, xy)
+            if use_njit:
+                draw_lines_batch(canvas, segs[:, 0], segs[:, 1],
+                                 np.array(color, dtype=np.uint8), thickness)
+            else:
+                cv2.polylines(canvas, list(segs), False, color, thickness)
+        self._overlay_segments.clear()
+    
+    def blit_queued_labels(self, frame: np.ndarray):
+        """Blit queued labels from pre-rendered tiles (host memory only)."""
+        for text, x, y, color, scale in self._overlay_labels:
+            blit_label_tile(frame, render_label_tile(text, scale, color), int(x), int(y))
+        self._overlay_labels.clear()
+    
+    def _compose_hud_top(self, title: str, color: Tuple[int, int, int]):
+        """Draw the top banner (border and title) into its cached strip."""
+        strip = self._hud_top
+        strip.fill(0)
+        cv2.rectangle(strip, (0, 0), (VIDEO_WIDTH, HUD_TOP), COLOR_WHITE, 2)
+        blit_label_tile(strip, render_label_tile(title, 1.2, color, 2), 50, 45,
+                        skip_under_hud=False)
+    
+    def _compose_hud_bottom(self, status: str, timer: str):
+        """Draw the bottom status bar (status and timer) into its cached strip."""
+        strip = self._hud_bottom
+        strip.fill(0)
+        blit_label_tile(strip, render_label_tile(status, 0.7, COLOR_WHITE, 1),
+                        50, HUD_BOTTOM - 15, skip_under_hud=False)
+        blit_label_tile(strip, render_label_tile(timer, 0.6, COLOR_WHITE, 1),
+                        VIDEO_WIDTH - 150, HUD_BOTTOM - 15, skip_under_hud=False)
+    
+    def flush_overlays(self, frame: np.ndarray):
+        """Draw every queued box/segment and label onto the frame.
+        
+        Shapes are drawn in one batch per color and labels are blitted from pre-rendered tiles rather than laid out
+        with cv2.putText each time.
+        """
+        self.draw_queued_shapes(frame)
+        self.blit_queued_labels(frame)
     
     def render_hud(self, frame: np.ndarray, phase: Phase, elapsed: float):
-        """Render HUD overlay based on current phase."""
-        # Top banner
-        cv2.rectangle(frame, (0, 0), (VIDEO_WIDTH, 70), COLOR_BLACK, -1)
-        cv2.rectangle(frame, (0, 0), (VIDEO_WIDTH, 70), COLOR_WHITE, 2)
-        
-        # Phase-specific content
+        """Render HUD overlay based on current phase.
+        
+        Both bars are opaque, so each is composited once per distinct text
+        into a cached strip and pasted over the frame with one copy.
+        """
+        # Fault stats are derived from the masks once per frame
+        self.stats["ghosts"] = int(self.veh_has_ghost.sum())
+        self.stats["oosm_errors"] = int(self.veh_has_oosm.sum()) * self._raw_frames
+        self.stats["pancake_errors"] = int(self.drone_alive.sum()) * self._raw_frames
+        
+        # Phase-specific status values
+        stats = self.stats
         if phase == Phase.SETUP:
-            title = "MULTI-AGENT PERCEPTION GRID"
-            status = f"Agents: {len(self.vehicles) + len(self.drones)} | Network: UNSTABLE"
-            title_color = COLOR_WHITE
-            
+            values = (len(self.vehicles) + len(self.drones),)
         elif phase == Phase.CHAOS:
-            title = "RAW SENSOR VIEW - NO FUSION"
-            status = f"Status: CRITICAL | Ghosts: {self.stats['ghosts']} | Z-Axis: COLLAPSED"
-            title_color = COLOR_RAW
-            
+            values = (stats["ghosts"],)
         elif phase == Phase.ACTIVATION:
             progress = self.get_phase_progress(elapsed, phase)
-            title = "INITIALIZING GODVIEW CORE..."
-            status = f"H3 Sharding: {'ACTIVE' if progress > 0.3 else 'LOADING'} | Highlander: {'ON' if progress > 0.6 else 'SYNCING'}"
-            title_color = COLOR_YELLOW
-            
+            values = ("ACTIVE" if progress > 0.3 else "LOADING",
+                      "ON" if progress > 0.6 else "SYNCING")
         elif phase == Phase.SOLUTION:
-            self.stats["packets_fixed"] += random.randint(5, 15)
-            title = "GODVIEW CONSENSUS ACTIVE"
-            status = f"Status: STABLE | Late Packets Fixed: {self.stats['packets_fixed']} | Trust: VERIFIED"
-            title_color = COLOR_GODVIEW
-            
+            stats["packets_fixed"] += random.randint(5, 15)
+            values = (stats["packets_fixed"],)
         else:  # DEEPDIVE
-            title = "PERCEPTION GRID STABILIZED"
-            status = f"Precision: +400% | Malicious Packets Dropped: {self.stats['ghosts']} | Canonical State: CONVERGED"
-            title_color = COLOR_GODVIEW
+            values = (stats["ghosts"],)
         
-        # Draw title
-        cv2.putText(frame, title, (50, 45), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1.2, title_color, 2, cv2.LINE_AA)
+        title, title_color, template = HUD_TEXT[phase]
+        key = (phase, values)
+        if key != self._hud_status_key:
+            self._hud_status_key = key
+            self._hud_status = template.format(*values)
         
-        # Bottom status bar
-        cv2.rectangle(frame, (0, VIDEO_HEIGHT - 50), (VIDEO_WIDTH, VIDEO_HEIGHT), COLOR_BLACK, -1)
-        cv2.putText(frame, status, (50, VIDEO_HEIGHT - 15),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, COLOR_WHITE, 1, cv2.LINE_AA)
+        seconds = int(elapsed)
+        if seconds != self._hud_timer_key:
+            self._hud_timer_key = seconds
+            self._hud_timer = f"{seconds}s / 80s"
         
-        # Timer
-        timer_text = f"{int(elapsed)}s / 80s"
-        cv2.putText(frame, timer_text, (VIDEO_WIDTH - 150, VIDEO_HEIGHT - 15),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, COLOR_WHITE, 1, cv2.LINE_AA)
+        # Top banner
+        if phase != self._hud_top_key:
+            self._hud_top_key = phase
+            self._compose_hud_top(title, title_color)
+        frame[:HUD_TOP + 2] = self._hud_top
+        
+        # Bottom status bar and timer
+        bottom_key = (self._hud_status, self._hud_timer)
+        if bottom_key != self._hud_bottom_key:
+            self._hud_bottom_key = bottom_key
+            self._compose_hud_bottom(*bottom_key)
+        frame[VIDEO_HEIGHT - HUD_BOTTOM:] = self._hud_bottom
         
         # Activation scanline effect
         if phase == Phase.ACTIVATION:
@@ -478,73 +772,96 @@ class GodViewVideoDemo:
             scanline_y = int(VIDEO_HEIGHT * progress)
             cv2.line(frame, (0, scanline_y), (VIDEO_WIDTH, scanline_y), COLOR_YELLOW, 3)
     
-    def process_frame(self, elapsed: float) -> np.ndarray:
+    def process_frame(self, frame_idx: int, elapsed: float) -> np.ndarray:
         """Process a single frame with all overlays."""
         # Get camera frame
-        try:
-            frame = self.frame_queue.get(timeout=1.0)
-        except queue.Empty:
-            frame = np.zeros((VIDEO_HEIGHT, VIDEO_WIDTH, 3), dtype=np.uint8)
+        slot = self._next_camera_slot(timeout=1.0)
+        if slot is not None:
+            frame = self._frame_ring[slot]
+        else:
+            frame = self._blank_frame
+            frame.fill(0)
         
         phase = self.get_current_phase(elapsed)
-        show_raw = phase in [Phase.CHAOS, Phase.ACTIVATION]
-        show_godview = phase in [Phase.ACTIVATION, Phase.SOLUTION, Phase.DEEPDIVE]
+        show_raw = bool(phase.mask & RAW_PHASES)
+        show_godview = bool(phase.mask & GODVIEW_PHASES)
+        
+        self.update_true_positions()
+        if frame_idx % FPS == 0:
+            self.compact_dead_actors()  # Amortized: once per second
+        self.update_camera_cache()
+        if show_raw:
+            self._inject_faults_batch(frame_idx)
+        
+        alive = self.veh_alive
         
         # Draw vehicles
-        for vehicle in self.vehicles:
-            if not vehicle.is_alive:
-                continue
+        if show_raw:
+            raw_screen, raw_valid = self.project_points(self.veh_raw_xyz)
+            self.queue_boxes(raw_screen[alive & raw_valid], COLOR_RAW, "RAW")
             
-            true_loc = vehicle.get_location()
-            
-            if show_raw:
-                raw_loc, has_ghost = self.inject_faults(vehicle, true_loc)
-                self.draw_box(frame, raw_loc, COLOR_RAW, "RAW")
-                
-                # Draw ghost
-                if has_ghost and vehicle.id in self.ghost_actors:
-                    gx, gy = self.ghost_actors[vehicle.id]
-                    ghost_loc = carla.Location(raw_loc.x + gx, raw_loc.y + gy, raw_loc.z)
-                    self.draw_box(frame, ghost_loc, COLOR_GHOST, "GHOST")
-            
-            if show_godview and phase != Phase.CHAOS:
-                gv_loc = true_loc  # GodView = ground truth
-                self.draw_box(frame, gv_loc, COLOR_GODVIEW, "GV")
+            # Draw ghosts
+            ghost_screen, ghost_valid = self.project_points(self.veh_ghost_xyz)
+            self.queue_boxes(ghost_screen[alive & self.veh_ghost_shown & ghost_valid],
+                             COLOR_GHOST, "GHOST")
+        
+        if show_godview:
+            gv_screen, gv_valid = self.project_points(self.veh_true_xyz)  # GodView = ground truth
+            self.queue_boxes(gv_screen[alive & gv_valid], COLOR_GODVIEW, "GV")
         
         # Draw drones
-        for drone, height in self.drones:
-            if not drone.is_alive:
-                continue
-            
-            true_loc = drone.get_location()
-            true_loc.z = height  # Maintain altitude
-            
-            if show_raw:
-                # Pancake world - show at ground
-                pancake_loc = carla.Location(true_loc.x, true_loc.y, 0.5)
-                self.draw_box(frame, pancake_loc, COLOR_RAW, "DRONE Z=0!", size=30)
-            
-            if show_godview and phase != Phase.CHAOS:
-                # Correct altitude with stem
-                self.draw_box(frame, true_loc, COLOR_GODVIEW, "DRONE", size=30)
-                self.draw_drone_stem(frame, true_loc, height, COLOR_GODVIEW)
+        drone_alive = self.drone_alive
+        ground_xyz = self.drone_true_xyz.copy()
+        
+        if show_raw:
+            # Pancake world - show at ground
+            ground_xyz[:, 2] = 0.5
+            pancake_screen, pancake_valid = self.project_points(ground_xyz)
+            self.queue_boxes(pancake_screen[drone_alive & pancake_valid],
+                             COLOR_RAW, "DRONE Z=0!", size=30)
+        
+        if show_godview:
+            # Correct altitude with stem
+            ground_xyz[:, 2] = 0.1
+            top_screen, top_valid = self.project_points(self.drone_true_xyz)
+            bottom_screen, bottom_valid = self.project_points(ground_xyz)
+            shown = drone_alive & top_valid
+            self.queue_boxes(top_screen[shown], COLOR_GODVIEW, "DRONE", size=30)
+            for i in np.flatnonzero(shown & bottom_valid):
+                self.queue_drone_stem(top_screen[i], bottom_screen[i],
+                                      self.drones[i][1], COLOR_GODVIEW)
         
         # Draw Sybil attack
         if self.sybil_pos:
-            sybil_loc = carla.Location(self.sybil_pos[0], self.sybil_pos[1], self.sybil_pos[2])
+            # The Sybil obstacle is static: reproject only when the camera moves
+            if self._sybil_cache[0] != self._cam_pose_key:
+                self._sybil_cache = (self._cam_pose_key, self.world_to_screen(self.sybil_pos))
+            screen_pos = self._sybil_cache[1]
             
-            if show_raw:
-                self.draw_box(frame, sybil_loc, COLOR_SYBIL, "SYBIL!", size=50)
+            if show_raw and screen_pos:
+                self.queue_boxes(np.array([screen_pos], dtype=np.int32),
+                                 COLOR_SYBIL, "SYBIL!", size=50)
             
-            if show_godview and phase not in [Phase.SETUP, Phase.CHAOS]:
+            if show_godview:
                 # Show rejection
-                screen_pos = self.world_to_screen(sybil_loc)
                 if screen_pos:
                     x, y = screen_pos
-                    cv2.line(frame, (x - 30, y - 30), (x + 30, y + 30), COLOR_GODVIEW, 3)
-                    cv2.line(frame, (x - 30, y + 30), (x + 30, y - 30), COLOR_GODVIEW, 3)
-                    cv2.putText(frame, "REJECTED", (x - 40, y - 40),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, COLOR_GODVIEW, 1, cv2.LINE_AA)
+                    self.queue_segment((x - 30, y - 30), (x + 30, y + 30), COLOR_GODVIEW, 3)
+                    self.queue_segment((x - 30, y + 30), (x + 30, y - 30), COLOR_GODVIEW, 3)
+                    self._overlay_labels.append(("REJECTED", x - 40, y - 40, COLOR_GODVIEW, 0.5))
+        
+        if self.use_opencl:
+            # Tiles blend in host memory, so blit them before the single
+            # upload; shapes draw on the OpenCL device and the HUD strips
+            # are pasted after download
+            self.blit_queued_labels(frame)
+            canvas = cv2.UMat(frame)
+            self.draw_queued_shapes(canvas)
+            frame = canvas.get()
+            self.render_hud(frame, phase, elapsed)
+            return frame
+        
+        self.flush_overlays(frame)
         
         # Render HUD
         self.render_hud(frame, phase, elapsed)
@@ -563,6 +880,15 @@ class GodViewVideoDemo:
         self.start_time = time.time()
         total_frames = duration * FPS
         
+        # Pre-draw fault randomness for the whole run: (frame, vehicle[, xy])
+        self._jitter = self._rng.normal(
+            0, 1.2, (total_frames, len(self.vehicles), 2)
+        ).astype(np.float32)
+        self._ghost_roll = self._rng.random(
+            (total_frames, len(self.vehicles)), dtype=np.float32)
+        self._ghost_pool = self._rng.uniform(
+            -3, 3, (total_frames, len(self.vehicles), 2)).astype(np.float32)
+        
         try:
             for f in range(total_frames):
                 # Tick world
@@ -576,11 +902,8 @@ class GodViewVideoDemo:
                 # Update camera
                 self.update_camera_for_phase(phase, progress)
                 
-                # Wait for frame
-                time.sleep(0.01)  # Give camera time to capture
-                
-                # Process and write frame
-                frame = self.process_frame(elapsed)
+                # Process and write frame (blocks until the camera delivers)
+                frame = self.process_frame(f, elapsed)
                 self.video_writer.write(frame)
                 
                 # Progress output
@@ -629,6 +952,7 @@ def main():
     parser = argparse.ArgumentParser(description="GodView LinkedIn Demo - MP4 Output")
     parser.add_argument("--duration", type=int, default=80, help="Demo duration in seconds")
     parser.add_argument("--output", type=str, default="godview_demo.mp4", help="Output MP4 filename")
+    parser.add_argument("--opencl", action="store_true", help="Draw overlays with OpenCL (cv2.UMat) if available")
     args = parser.parse_args()
     
     OUTPUT_FILE = args.output
@@ -640,7 +964,7 @@ def main():
     world = client.get_world()
     print(f"[INIT] Connected to {world.get_map().name}")
     
-    demo = GodViewVideoDemo(client, world)
+    demo = GodViewVideoDemo(client, world, use_opencl=args.opencl)
     demo.setup_world()
     demo.spawn_camera()
     demo.spawn_actors()
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 """GodView 30s Demo - Build Script"""
 
+import os
 import subprocess
 import sys
+import threading
 from pathlib import Path
 
 
@@ -15,6 +17,33 @@ def run(name, cmd):
     print(f"✓ {name} complete")
 
 
+def run_parallel(name, cmds):
+    """Run independent commands concurrently, streaming their output line by line."""
+    print(f"\n{'='*60}\nSTEP: {name} ({len(cmds)} workers)\n{'='*60}")
+
+    def stream(tag, proc):
+        for line in proc.stdout:
+            print(f"[{tag}] {line}", end="", flush=True)
+
+    procs = []
+    for i, cmd in enumerate(cmds):
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                bufsize=1, text=True)
+        reader = threading.Thread(target=stream, args=(f"{i + 1}/{len(cmds)}", proc))
+        reader.start()
+        procs.append((proc, reader))
+
+    failed = 0
+    for proc, reader in procs:
+        proc.wait()
+        reader.join()
+        failed = failed or proc.returncode
+    if failed:
+        print(f"ERROR: {name} failed")
+        sys.exit(failed)
+    print(f"✓ {name} complete")
+
+
 def main():
     script_dir = Path(__file__).parent.absolute()
     out_dir = script_dir / "out"
@@ -23,9 +52,14 @@ def main():
     print("GODVIEW 30s DEMO BUILDER")
     print("=" * 60)
 
-    run("Generate Logs", [sys.executable, str(script_dir / "generate_demo_logs.py"), "--out", str(out_dir)])
-    run("Render Frames", [sys.executable, str(script_dir / "render_frames.py"), "--out", str(out_dir)])
-    run("Encode Video", [sys.executable, str(script_dir / "encode_video.py"), "--out", str(out_dir)])
+    run("Generate Logs", [sys.executable, "-OO", str(script_dir / "generate_demo_logs.py"), "--out", str(out_dir)])
+    shards = os.cpu_count() or 1
+    run_parallel("Render Frames", [
+        [sys.executable, "-OO", str(script_dir / "render_frames.py"), "--out", str(out_dir),
+         "--shard", str(i), "--shards", str(shards)]
+        for i in range(shards)
+    ])
+    run("Encode Video", [sys.executable, "-OO", str(script_dir / "encode_video.py"), "--out", str(out_dir)])
 
     final = out_dir / "final_godview_30s.mp4"
     print("\n" + "=" * 60)
@@ -7,14 +7,31 @@ Simple world: 2 agents + 1 drone + 1 hero pedestrian + building occluder.
 """
 
 import argparse
+import contextlib
 import json
 import math
 import os
-import random
+import shutil
 from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from typing import Any, List, Dict, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
+
+# Optional fast JSON encoder for the NDJSON logs
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional compressor for the repetitive world-state logs (--compress)
+try:
+    import blosc2
+    HAS_BLOSC2 = True
+except ImportError:
+    HAS_BLOSC2 = False
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -36,7 +53,14 @@ SCALE_AGENTS = [{"id": f"agent_{i:02d}", "x": 20 + i*2, "y": -20 + i} for i in r
 BUILDING = {"x": 5, "y": 5, "width": 8, "height": 10}
 
 # Hero object: pedestrian behind building
-HERO_PED = {"id": "ped_hero", "class": "pedestrian", "x": 12, "y": 8, "vx": -0.1, "vy": 0}
+HERO_PED: Dict[str, Any] = {"id": "ped_hero", "class": "pedestrian",
+                            "x": 12, "y": 8, "vx": -0.1, "vy": 0}
+
+# Detection position noise (std dev, m): agent A x/y, agent B x/y, drone x/y
+NOISE_SIGMA = np.array([0.1, 0.1, 0.1, 0.1, 0.15, 0.15])
+
+# Offset of the drone's un-merged detection in the BEFORE world state (m)
+RAW_DRONE_OFFSET = np.array([0.3, -0.2])
 
 # Background objects (optional, not focus)
 BG_CARS = [
@@ -51,47 +75,140 @@ BEAT_MERGE = (360, 600)         # 12-20s
 BEAT_TRUST = (600, 780)         # 20-26s
 BEAT_SCALE = (780, 900)         # 26-30s
 
+# Sub-ranges within beats (frames)
+DRONE_DELAY_FRAMES = (400, 420)  # Drone packets delivered late (merge beat)
+SPOOF_FRAMES = (650, 700)        # Spoof packets sent (trust beat)
+
+# One-shot event frames (OOSM_CORRECTED fires as the drone delay ends)
+PACKET_ARRIVAL_FRAME = 200  # Occlusion beat
+MERGE_FRAME = 450           # Merge beat
+TRUST_REJECT_FRAME = 680    # Trust beat
+
 
 # =============================================================================
 # GEOMETRY
 # =============================================================================
 
-def line_intersects_rect(ax: float, ay: float, bx: float, by: float,
-                          rx: float, ry: float, rw: float, rh: float) -> bool:
-    """Check if line segment (ax,ay)-(bx,by) intersects rectangle centered at (rx,ry)."""
-    # Sample points along line
-    for t in [i * 0.05 for i in range(1, 20)]:
-        px = ax + t * (bx - ax)
-        py = ay + t * (by - ay)
-        if (rx - rw/2 <= px <= rx + rw/2) and (ry - rh/2 <= py <= ry + rh/2):
-            return True
-    return False
-
-
-def is_occluded(agent_x: float, agent_y: float, obj_x: float, obj_y: float) -> bool:
-    """Check if object is occluded from agent by building."""
-    return line_intersects_rect(
-        agent_x, agent_y, obj_x, obj_y,
+def segments_intersect_rect(ax: np.ndarray, ay: np.ndarray, bx: np.ndarray, by: np.ndarray,
+                            rx: float, ry: float, rw: float, rh: float) -> np.ndarray:
+    """Check which segments (ax,ay)-(bx,by) intersect the rectangle centered at (rx,ry).
+
+    Liang-Barsky clipping over broadcastable arrays of segments: narrow each
+    segment's parameter range [0, 1] against the four rectangle edges.
+    """
+    ax, ay, bx, by = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64)
+                                           for v in (ax, ay, bx, by)))
+    dx = bx - ax
+    dy = by - ay
+    tmin = np.zeros(ax.shape)
+    tmax = np.ones(ax.shape)
+    hit = np.ones(ax.shape, dtype=bool)
+    for p, q in ((-dx, ax - (rx - rw / 2)), (dx, (rx + rw / 2) - ax),
+                 (-dy, ay - (ry - rh / 2)), (dy, (ry + rh / 2) - ay)):
+        hit &= ~((p == 0) & (q < 0))  # Parallel to this edge and outside it
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = q / p
+        tmin = np.where(p < 0, np.maximum(tmin, t), tmin)
+        tmax = np.where(p > 0, np.minimum(tmax, t), tmax)
+    return hit & (tmin <= tmax)
+
+
+def occlusion_mask(agents_xy: np.ndarray, objs_xy: np.ndarray) -> np.ndarray:
+    """Occlusion by the building for every (frame, agent, object) sight line.
+
+    agents_xy: (A, 2) static agent positions; objs_xy: (F, O, 2) object
+    tracks. Returns an (F, A, O) boolean mask.
+    """
+    agents = agents_xy[None, :, None, :]
+    objs = objs_xy[:, None, :, :]
+    return segments_intersect_rect(
+        agents[..., 0], agents[..., 1], objs[..., 0], objs[..., 1],
         BUILDING["x"], BUILDING["y"], BUILDING["width"], BUILDING["height"]
     )
 
 
+def frame_mask(*ranges: Tuple[int, int]) -> np.ndarray:
+    """Per-frame boolean mask, True where the frame lies in every [start, end) range."""
+    mask = np.ones(TOTAL_FRAMES, dtype=bool)
+    for start, end in ranges:
+        in_range = np.zeros(TOTAL_FRAMES, dtype=bool)
+        in_range[start:end] = True
+        mask &= in_range
+    return mask
+
+
 # =============================================================================
 # DATA GENERATION
 # =============================================================================
 
+# Shared read-only covariances and source lists (serialized as JSON arrays)
+_COV_015 = (0.15, 0, 0, 0.15)
+_COV_03 = (0.3, 0, 0, 0.3)
+_COV_04 = (0.4, 0, 0, 0.4)
+_COV_10 = (1.0, 0, 0, 1.0)
+_SRC_A = ("agent_A",)
+_SRC_DRONE = ("drone",)
+_SRC_SPOOF = ("unknown_node",)
+
+# Per-agent local pedestrian IDs, cycling every 100 frames
+_A_PED_IDS = [f"A_ped_{i:02d}" for i in range(100)]
+_B_PED_IDS = [f"B_ped_{i:02d}" for i in range(100)]
+_D_PED_IDS = [f"D_ped_{(i + 50) % 100:02d}" for i in range(100)]  # Offset from A/B
+
+# BEFORE world-state objects: raw detections carry only a per-frame pose,
+# the accepted spoof never changes
+_RAW_A_PED_TEMPLATE: Dict[str, Any] = {
+    "canonical_object_id": "raw_A_ped",
+    "class": "pedestrian",
+    "pose": None,
+    "covariance": _COV_03,
+    "source_agents": _SRC_A,
+    "confidence": 0.85,
+}
+_RAW_D_PED_TEMPLATE: Dict[str, Any] = {
+    "canonical_object_id": "raw_D_ped",
+    "class": "pedestrian",
+    "pose": None,
+    "covariance": _COV_04,
+    "source_agents": _SRC_DRONE,
+    "confidence": 0.75,
+}
+_SPOOF_PED: Dict[str, Any] = {
+    "canonical_object_id": "SPOOF_ped",
+    "class": "pedestrian",
+    "pose": {"position": {"x": -5, "y": 10, "z": 0}, "yaw": 0},
+    "covariance": _COV_10,
+    "source_agents": _SRC_SPOOF,
+    "confidence": 0.9,
+}
+
+# AFTER world-state pedestrian: only its pose and sources change per frame
+_SRC_FUSED = ("agent_A", "drone")
+_SRC_FUSED_B = ("agent_A", "drone", "agent_B")
+_FUSED_PED_TEMPLATE: Dict[str, Any] = {
+    "canonical_object_id": "canonical_ped_1",
+    "class": "pedestrian",
+    "pose": None,
+    "covariance": _COV_015,  # Reduced by fusion
+    "source_agents": _SRC_FUSED,
+    "confidence": 0.95,
+}
+
+
 @dataclass
 class DetectedObject:
+    __slots__ = ("local_id", "obj_class", "x", "y", "z", "yaw", "cov", "confidence")
+
     local_id: str
     obj_class: str
     x: float
     y: float
     z: float
     yaw: float
-    cov: List[float]
+    cov: Tuple[float, ...]
     confidence: float
 
-    def to_dict(self):
+    def to_dict(self) -> Dict:
         return {
             "local_object_id": self.local_id,
             "class": self.obj_class,
@@ -102,7 +219,7 @@ class DetectedObject:
 
 
 def generate_detection_packet(frame: int, agent: Dict, objects: List[DetectedObject],
-                               delivery_frame: int = None, sig_valid: bool = True) -> Dict:
+                               delivery_frame: Optional[int] = None, sig_valid: bool = True) -> Dict:
     if delivery_frame is None:
         delivery_frame = frame
     return {
@@ -112,7 +229,7 @@ def generate_detection_packet(frame: int, agent: Dict, objects: List[DetectedObj
         "agent_id": agent["id"],
         "delivery_frame": delivery_frame,
         "signature_valid": sig_valid,
-        "objects": [o.to_dict() for o in objects],
+        "objects": list(map(DetectedObject.to_dict, objects)),
     }
 
 
@@ -125,112 +242,234 @@ def generate_canonical_state(frame: int, objects: List[Dict]) -> Dict:
     }
 
 
-def generate_logs(out_dir: Path, seed: int = 42):
-    random.seed(seed)
+def encode_ndjson_line(record: Dict) -> bytes:
+    """Serialize one record as a newline-terminated NDJSON line."""
+    if HAS_ORJSON:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record) + "\n").encode()
+
+
+class NDJSONStream:
+    """Append-only NDJSON file; each record is serialized and written as it is produced."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, "wb", buffering=1 << 20)
+
+    def append(self, record: Dict) -> None:
+        self._file.write(encode_ndjson_line(record))
+        self.count += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "NDJSONStream":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class CompressedNDJSONStream(NDJSONStream):
+    """NDJSON collected in memory and written as one LZ4 Blosc2 frame on close.
+
+    Used for the world-state logs, whose lines repeat almost verbatim every
+    frame. render_frames.py reads the .ndjson.blosc2 file in place of the
+    plain one.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self._buf = bytearray()
+
+    def append(self, record: Dict) -> None:
+        self._buf += encode_ndjson_line(record)
+        self.count += 1
+
+    def close(self) -> None:
+        with open(self.path, "wb") as f:
+            f.write(blosc2.compress2(bytes(self._buf), codec=blosc2.Codec.LZ4, clevel=5))
+
+
+# packets_after.ndjson is not streamed: both sides receive the same packets
+# (the spoof is still sent, AFTER rejects it downstream), so it is a link
+# to packets_before.ndjson
+NDJSON_STREAMS = ("packets_before", "world_before", "world_after",
+                  "events_before", "events_after")
+COMPRESSIBLE_STREAMS = ("world_before", "world_after")
+
+
+def open_stream(out_dir: Path, name: str, compress: bool) -> NDJSONStream:
+    """Open the output stream for one log, removing any stale other-format copy."""
+    plain = out_dir / f"{name}.ndjson"
+    packed = out_dir / f"{name}.ndjson.blosc2"
+    if compress and name in COMPRESSIBLE_STREAMS:
+        plain.unlink(missing_ok=True)
+        return CompressedNDJSONStream(packed)
+    packed.unlink(missing_ok=True)
+    return NDJSONStream(plain)
+
+
+def generate_logs(out_dir: Path, seed: int = 42, compress: bool = False,
+                  pretty: bool = False) -> None:
+    """Write the BEFORE/AFTER logs and config to out_dir.
+
+    All randomness comes from one NumPy PCG64 generator seeded with seed,
+    so a given seed always reproduces the same logs. With compress, the
+    world-state logs are written Blosc2-compressed (needs blosc2). The
+    config is written compact unless pretty asks for an indented file.
+    """
+    rng = np.random.default_rng(seed)
     os.makedirs(out_dir, exist_ok=True)
 
-    # Data buffers
-    packets_before = []
-    packets_after = []
-    world_before = []
-    world_after = []
-    events_before = []
-    events_after = []
-
-    # Object positions (will update per frame)
-    ped_x, ped_y = HERO_PED["x"], HERO_PED["y"]
-    car1_x, car1_y = BG_CARS[0]["x"], BG_CARS[0]["y"]
-    car2_x, car2_y = BG_CARS[1]["x"], BG_CARS[1]["y"]
-
-    # Event flags
-    merge_emitted = False
-    trust_reject_emitted = False
-    oosm_emitted = False
-    packet_arrival_emitted = False
+    # Records go straight to disk, so memory stays flat however long the run
+    with contextlib.ExitStack() as stack:
+        streams = {name: stack.enter_context(open_stream(out_dir, name, compress))
+                   for name in NDJSON_STREAMS}
+        simulate_frames(rng, **streams)
+    for stream in streams.values():
+        print(f"Wrote {stream.count} records to {stream.path}")
+
+    packets_before = streams["packets_before"].path
+    packets_after = out_dir / "packets_after.ndjson"
+    if packets_after.exists():
+        packets_after.unlink()
+    try:
+        os.link(packets_before, packets_after)
+    except OSError:  # No hard links on this filesystem
+        shutil.copyfile(packets_before, packets_after)
+    print(f"Linked {packets_after} to {packets_before}")
+
+    # Write building config
+    config = {
+        "building": BUILDING,
+        "agent_a": AGENT_A,
+        "agent_b": AGENT_B,
+        "drone": DRONE,
+        "hero_ped": HERO_PED,
+        "beats": {
+            "thesis": BEAT_THESIS,
+            "occlusion": BEAT_OCCLUSION,
+            "merge": BEAT_MERGE,
+            "trust": BEAT_TRUST,
+            "scale": BEAT_SCALE,
+        },
+    }
+    if HAS_ORJSON:
+        with open(out_dir / "config.json", "wb") as f:
+            f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2 if pretty else 0))
+    else:
+        with open(out_dir / "config.json", "w") as f:
+            json.dump(config, f, indent=2 if pretty else None,
+                      separators=None if pretty else (",", ":"))
+    print(f"Wrote config to {out_dir / 'config.json'}")
 
-    for frame in range(TOTAL_FRAMES):
-        dt = 1.0 / FPS
 
-        # Update positions (slow movement)
-        ped_x += HERO_PED["vx"] * dt
-        ped_y += HERO_PED["vy"] * dt
-        car1_x += BG_CARS[0]["vx"] * dt
-        car2_x += BG_CARS[1]["vx"] * dt
+def simulate_frames(rng: np.random.Generator,
+                    packets_before: NDJSONStream,
+                    world_before: NDJSONStream, world_after: NDJSONStream,
+                    events_before: NDJSONStream, events_after: NDJSONStream) -> None:
+    """Run every frame of the scenario, appending records to the output streams."""
+    # Pedestrian track (slow movement), accumulated step by step exactly as
+    # a per-frame update would, then every agent's sight line to it tested
+    # against the building in one pass into per-agent visibility bitmaps
+    dt = 1.0 / FPS
+    ped_track = np.empty((TOTAL_FRAMES + 1, 2))
+    ped_track[0] = (HERO_PED["x"], HERO_PED["y"])
+    ped_track[1:] = (HERO_PED["vx"] * dt, HERO_PED["vy"] * dt)
+    ped_track = np.cumsum(ped_track, axis=0)[1:]
+    agents_xy = np.array([(AGENT_A["x"], AGENT_A["y"]), (AGENT_B["x"], AGENT_B["y"])])
+    a_sees, b_sees = (~occlusion_mask(agents_xy, ped_track[:, None, :])[:, :, 0]).T.tolist()
+
+    # Per-detection position noise for every frame in one draw:
+    # columns are agent A (x, y), agent B (x, y), drone (x, y)
+    noise = rng.standard_normal((TOTAL_FRAMES, 6)) * NOISE_SIGMA
+
+    # Detected positions per source as (frame, xy) columns, computed in bulk;
+    # the loop only picks rows out of them
+    det_a = (ped_track + noise[:, 0:2]).tolist()
+    det_b = (ped_track + noise[:, 2:4]).tolist()
+    det_drone = (ped_track + noise[:, 4:6]).tolist()
+    raw_drone = (ped_track + RAW_DRONE_OFFSET).tolist()  # BEFORE ghost duplicate
+    ped_xy = ped_track.tolist()
+
+    # Beat schedule is static, so every per-frame beat test is a lookup
+    drone_delayed_at = frame_mask(BEAT_MERGE, DRONE_DELAY_FRAMES).tolist()
+    spoofing_at = frame_mask(BEAT_TRUST, SPOOF_FRAMES).tolist()
+
+    for frame in range(TOTAL_FRAMES):
+        ped_x, ped_y = ped_xy[frame]
 
         # Determine beat
-        in_occlusion = BEAT_OCCLUSION[0] <= frame < BEAT_OCCLUSION[1]
-        in_merge = BEAT_MERGE[0] <= frame < BEAT_MERGE[1]
-        in_trust = BEAT_TRUST[0] <= frame < BEAT_TRUST[1]
+        spoofing = spoofing_at[frame]
 
         # =========== AGENT A DETECTIONS ===========
         # A can see pedestrian (no occlusion from A's position)
-        a_sees_ped = not is_occluded(AGENT_A["x"], AGENT_A["y"], ped_x, ped_y)
+        a_sees_ped = a_sees[frame]
         if a_sees_ped:
             ped_det_a = DetectedObject(
-                local_id=f"A_ped_{frame % 100:02d}",  # A's local ID
+                local_id=_A_PED_IDS[frame % 100],  # A's local ID
                 obj_class="pedestrian",
-                x=ped_x + random.gauss(0, 0.1),
-                y=ped_y + random.gauss(0, 0.1),
+                x=det_a[frame][0],
+                y=det_a[frame][1],
                 z=0, yaw=0,
-                cov=[0.3, 0, 0, 0.3],
+                cov=_COV_03,
                 confidence=0.85,
             )
             pkt_a = generate_detection_packet(frame, AGENT_A, [ped_det_a])
             packets_before.append(pkt_a)
-            packets_after.append(pkt_a)
 
         # =========== AGENT B DETECTIONS ===========
         # B is occluded from ped by building
-        b_sees_ped = not is_occluded(AGENT_B["x"], AGENT_B["y"], ped_x, ped_y)
+        b_sees_ped = b_sees[frame]
 
         if b_sees_ped:
             # B can see (rare, only if ped moves)
             ped_det_b = DetectedObject(
-                local_id=f"B_ped_{frame % 100:02d}",
+                local_id=_B_PED_IDS[frame % 100],
                 obj_class="pedestrian",
-                x=ped_x + random.gauss(0, 0.1),
-                y=ped_y + random.gauss(0, 0.1),
+                x=det_b[frame][0],
+                y=det_b[frame][1],
                 z=0, yaw=0,
-                cov=[0.3, 0, 0, 0.3],
+                cov=_COV_03,
                 confidence=0.80,
             )
             pkt_b = generate_detection_packet(frame, AGENT_B, [ped_det_b])
             packets_before.append(pkt_b)
-            packets_after.append(pkt_b)
 
         # =========== DRONE DETECTIONS ===========
         # Drone sees everything from above
         ped_det_drone = DetectedObject(
-            local_id=f"D_ped_{(frame + 50) % 100:02d}",  # Different ID!
+            local_id=_D_PED_IDS[frame % 100],  # Different ID!
             obj_class="pedestrian",
-            x=ped_x + random.gauss(0, 0.15),
-            y=ped_y + random.gauss(0, 0.15),
+            x=det_drone[frame][0],
+            y=det_drone[frame][1],
             z=0, yaw=0,
-            cov=[0.4, 0, 0, 0.4],
+            cov=_COV_04,
             confidence=0.75,
         )
 
         # OOSM: delay drone packet during merge beat
         delivery = frame
-        if in_merge and 400 <= frame < 420:
+        if drone_delayed_at[frame]:
             delivery = frame + 10  # Delayed by 10 frames
 
         pkt_drone = generate_detection_packet(frame, DRONE, [ped_det_drone], delivery)
         packets_before.append(pkt_drone)
-        packets_after.append(pkt_drone)
 
         # =========== SPOOF PACKET ===========
-        if in_trust and 650 <= frame < 700:
+        if spoofing:
             spoof_det = DetectedObject(
                 local_id="SPOOF_ped_99",
                 obj_class="pedestrian",
                 x=-5, y=10, z=0, yaw=0,
-                cov=[1.0, 0, 0, 1.0],
+                cov=_COV_10,
                 confidence=0.9,
             )
             pkt_spoof = generate_detection_packet(frame, SPOOF, [spoof_det], sig_valid=False)
-            packets_before.append(pkt_spoof)
-            packets_after.append(pkt_spoof)  # Still sent, but will be rejected
+            packets_before.append(pkt_spoof)  # Still sent, but AFTER will reject it
 
         # =========== WORLD STATE BEFORE ===========
         # Before: no fusion, show all raw detections as separate objects
@@ -238,35 +477,19 @@ def generate_logs(out_dir: Path, seed: int = 42):
 
         # A's detection
         if a_sees_ped:
-            before_objs.append({
-                "canonical_object_id": f"raw_A_ped",
-                "class": "pedestrian",
-                "pose": {"position": {"x": ped_x, "y": ped_y, "z": 0}, "yaw": 0},
-                "covariance": [0.3, 0, 0, 0.3],
-                "source_agents": ["agent_A"],
-                "confidence": 0.85,
-            })
+            raw_a = _RAW_A_PED_TEMPLATE.copy()
+            raw_a["pose"] = {"position": {"x": ped_x, "y": ped_y, "z": 0}, "yaw": 0}
+            before_objs.append(raw_a)
 
         # Drone's detection (different ID = ghost duplicate)
-        before_objs.append({
-            "canonical_object_id": f"raw_D_ped",
-            "class": "pedestrian",
-            "pose": {"position": {"x": ped_x + 0.3, "y": ped_y - 0.2, "z": 0}, "yaw": 0},
-            "covariance": [0.4, 0, 0, 0.4],
-            "source_agents": ["drone"],
-            "confidence": 0.75,
-        })
+        raw_d = _RAW_D_PED_TEMPLATE.copy()
+        raw_d["pose"] = {"position": {"x": raw_drone[frame][0], "y": raw_drone[frame][1], "z": 0},
+                         "yaw": 0}
+        before_objs.append(raw_d)
 
         # Accept spoof in BEFORE
-        if in_trust and 650 <= frame < 700:
-            before_objs.append({
-                "canonical_object_id": "SPOOF_ped",
-                "class": "pedestrian",
-                "pose": {"position": {"x": -5, "y": 10, "z": 0}, "yaw": 0},
-                "covariance": [1.0, 0, 0, 1.0],
-                "source_agents": ["unknown_node"],
-                "confidence": 0.9,
-            })
+        if spoofing:
+            before_objs.append(_SPOOF_PED)
 
         world_before.append(generate_canonical_state(frame, before_objs))
 
@@ -275,117 +498,74 @@ def generate_logs(out_dir: Path, seed: int = 42):
         after_objs = []
 
         # Merged canonical pedestrian
-        after_objs.append({
-            "canonical_object_id": "canonical_ped_1",
-            "class": "pedestrian",
-            "pose": {"position": {"x": ped_x, "y": ped_y, "z": 0}, "yaw": 0},
-            "covariance": [0.15, 0, 0, 0.15],  # Reduced by fusion
-            "source_agents": ["agent_A", "drone"] + (["agent_B"] if b_sees_ped else []),
-            "confidence": 0.95,
-        })
+        fused_ped = _FUSED_PED_TEMPLATE.copy()
+        fused_ped["pose"] = {"position": {"x": ped_x, "y": ped_y, "z": 0}, "yaw": 0}
+        fused_ped["source_agents"] = _SRC_FUSED_B if b_sees_ped else _SRC_FUSED
+        after_objs.append(fused_ped)
 
         # Spoof is REJECTED in AFTER (not in world state)
 
         world_after.append(generate_canonical_state(frame, after_objs))
 
-        # =========== EVENTS ===========
-        # PACKET_ARRIVAL (for occlusion beat)
-        if in_occlusion and frame == 200 and not packet_arrival_emitted:
-            events_after.append({
-                "packet_type": "EVENT",
-                "frame": frame,
-                "event_type": "PACKET_ARRIVAL",
-                "payload": {
-                    "src": "agent_A",
-                    "dst": "agent_B",
-                    "object_id": "ped_hero",
-                },
-            })
-            packet_arrival_emitted = True
-
-        # MERGE event
-        if in_merge and frame == 450 and not merge_emitted:
-            events_after.append({
-                "packet_type": "EVENT",
-                "frame": frame,
-                "event_type": "MERGE",
-                "payload": {
-                    "from_ids": ["A_ped", "D_ped"],
-                    "canonical_id": "canonical_ped_1",
-                },
-            })
-            merge_emitted = True
-
-        # TRUST_REJECT event
-        if in_trust and frame == 680 and not trust_reject_emitted:
-            events_after.append({
-                "packet_type": "EVENT",
-                "frame": frame,
-                "event_type": "TRUST_REJECT",
-                "payload": {
-                    "agent_id": "unknown_node",
-                    "reason": "invalid_signature",
-                },
-            })
-            trust_reject_emitted = True
-
-        # OOSM event
-        if in_merge and frame == 420 and not oosm_emitted:
-            events_after.append({
-                "packet_type": "EVENT",
-                "frame": frame,
-                "event_type": "OOSM_CORRECTED",
-                "payload": {
-                    "agent_id": "drone",
-                    "delayed_frames": 10,
-                },
-            })
-            oosm_emitted = True
-
-    # Write files
-    def write_ndjson(path, data):
-        with open(path, "w") as f:
-            for item in data:
-                f.write(json.dumps(item) + "\n")
-        print(f"Wrote {len(data)} records to {path}")
-
-    write_ndjson(out_dir / "packets_before.ndjson", packets_before)
-    write_ndjson(out_dir / "packets_after.ndjson", packets_after)
-    write_ndjson(out_dir / "world_before.ndjson", world_before)
-    write_ndjson(out_dir / "world_after.ndjson", world_after)
-    write_ndjson(out_dir / "events_before.ndjson", events_before)
-    write_ndjson(out_dir / "events_after.ndjson", events_after)
-
-    # Write building config
-    with open(out_dir / "config.json", "w") as f:
-        json.dump({
-            "building": BUILDING,
-            "agent_a": AGENT_A,
-            "agent_b": AGENT_B,
-            "drone": DRONE,
-            "hero_ped": HERO_PED,
-            "beats": {
-                "thesis": BEAT_THESIS,
-                "occlusion": BEAT_OCCLUSION,
-                "merge": BEAT_MERGE,
-                "trust": BEAT_TRUST,
-                "scale": BEAT_SCALE,
-            },
-        }, f, indent=2)
-    print(f"Wrote config to {out_dir / 'config.json'}")
+    # =========== EVENTS ===========
+    # One-shot events at fixed frames, emitted once in frame order
+    events_after.append({
+        "packet_type": "EVENT",
+        "frame": PACKET_ARRIVAL_FRAME,
+        "event_type": "PACKET_ARRIVAL",
+        "payload": {
+            "src": "agent_A",
+            "dst": "agent_B",
+            "object_id": "ped_hero",
+        },
+    })
+    events_after.append({
+        "packet_type": "EVENT",
+        "frame": DRONE_DELAY_FRAMES[1],
+        "event_type": "OOSM_CORRECTED",
+        "payload": {
+            "agent_id": "drone",
+            "delayed_frames": 10,
+        },
+    })
+    events_after.append({
+        "packet_type": "EVENT",
+        "frame": MERGE_FRAME,
+        "event_type": "MERGE",
+        "payload": {
+            "from_ids": ["A_ped", "D_ped"],
+            "canonical_id": "canonical_ped_1",
+        },
+    })
+    events_after.append({
+        "packet_type": "EVENT",
+        "frame": TRUST_REJECT_FRAME,
+        "event_type": "TRUST_REJECT",
+        "payload": {
+            "agent_id": "unknown_node",
+            "reason": "invalid_signature",
+        },
+    })
 
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--out", default="./out")
-    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Seed for the NumPy generator; same seed, same logs")
+    parser.add_argument("--compress", action="store_true",
+                        help="Write world_*.ndjson Blosc2-compressed (.ndjson.blosc2)")
+    parser.add_argument("--pretty", action="store_true",
+                        help="Indent config.json for reading by hand")
     args = parser.parse_args()
+    if args.compress and not HAS_BLOSC2:
+        parser.error("--compress requires blosc2 (pip install blosc2)")
 
     print("=" * 60)
     print("GodView 30s Demo - Log Generator")
     print("=" * 60)
 
-    generate_logs(Path(args.out), args.seed)
+    generate_logs(Path(args.out), args.seed, args.compress, args.pretty)
 
     print("=" * 60)
     print("DONE")
@@ -18,6 +18,13 @@ from typing import Dict, List, Tuple
 import cv2
 import numpy as np
 
+# Optional: world logs written with generate_demo_logs.py --compress
+try:
+    import blosc2
+    HAS_BLOSC2 = True
+except ImportError:
+    HAS_BLOSC2 = False
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -106,6 +113,13 @@ class DataLoader:
 
     def _load_ndjson(self, name: str) -> List[Dict]:
         path = self.out_dir / name
+        packed = path.with_name(path.name + ".blosc2")
+        if packed.exists():
+            if not HAS_BLOSC2:
+                raise RuntimeError(f"{packed} needs blosc2 (pip install blosc2)")
+            with open(packed, "rb") as f:
+                text = blosc2.decompress2(f.read())
+            return [json.loads(line) for line in text.splitlines()]
         data = []
         with open(path) as f:
             for line in f:
@@ -468,6 +482,8 @@ class Renderer:
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--out", default="./out")
+    parser.add_argument("--shard", type=int, default=0, help="This worker's shard index")
+    parser.add_argument("--shards", type=int, default=1, help="Number of parallel render workers")
     args = parser.parse_args()
 
     out_dir = Path(args.out)
@@ -482,17 +498,19 @@ def main():
     renderer = Renderer(data)
 
     total_frames = 900
-    print(f"Rendering {total_frames} frames...")
+    # Frames are independent, so workers take interleaved frames
+    frames = range(args.shard, total_frames, args.shards)
+    print(f"Rendering {len(frames)} of {total_frames} frames...")
 
-    for frame in range(total_frames):
+    for i, frame in enumerate(frames):
         img = renderer.render_frame(frame)
         path = frames_dir / f"frame_{frame:05d}.png"
         cv2.imwrite(str(path), img)
 
-        if frame % 150 == 0:
+        if i % (150 // args.shards or 1) == 0:
             print(f"  Frame {frame}/900 ({frame/30:.0f}s)")
 
-    print(f"Rendered {total_frames} frames to {frames_dir}")
+    print(f"Rendered {len(frames)} frames to {frames_dir}")
 
 
 if __name__ == "__main__":
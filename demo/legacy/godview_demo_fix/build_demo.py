@@ -4,11 +4,12 @@ GodView Demo Fix - Build Script
 ================================
 One command runs the complete pipeline:
 1. Generate logs
-2. Render frames
-3. Encode video
+2. Render frames (piped straight into ffmpeg)
+3. Encode video (only with --png, from out/frames/*.png)
 
 Usage:
     python3 build_demo.py
+    python3 build_demo.py --png    # keep the per-frame PNGs
 """
 
 import argparse
@@ -40,6 +41,8 @@ def main():
     parser.add_argument("--fps", type=int, default=30, help="FPS")
     parser.add_argument("--skip_logs", action="store_true")
     parser.add_argument("--skip_render", action="store_true")
+    parser.add_argument("--png", action="store_true",
+                        help="Render PNG frames and encode them in a separate step")
     args = parser.parse_args()
 
     script_dir = Path(__file__).parent.absolute()
@@ -70,14 +73,15 @@ def main():
             sys.executable, str(script_dir / "render_frames.py"),
             "--out", str(out_dir),
             "--fps", str(args.fps),
-        ])
+        ] + (["--png"] if args.png else []))
 
-    # Step 3: Encode video
-    run_step("Encode Video", [
-        sys.executable, str(script_dir / "encode_video.py"),
-        "--out", str(out_dir),
-        "--fps", str(args.fps),
-    ])
+    # Step 3: Encode video (the default render already wrote it through the ffmpeg pipe)
+    if args.png:
+        run_step("Encode Video", [
+            sys.executable, str(script_dir / "encode_video.py"),
+            "--out", str(out_dir),
+            "--fps", str(args.fps),
+        ])
 
     final_video = out_dir / "final_godview_demo_fixed.mp4"
     print("\n" + "=" * 60)
@@ -20,11 +20,19 @@ import argparse
 import json
 import math
 import os
-import random
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Set, Tuple
 from pathlib import Path
 
+import numpy as np
+
+# Optional fast JSON encoder for the NDJSON logs
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -37,6 +45,16 @@ INTERSECTION_CENTER = (0, 0)
 INTERSECTION_RADIUS = 25.0
 ROAD_WIDTH = 8.0
 
+# Sensor model: cars see 25m, the drone 35m; each visible object is
+# detected with DETECTION_RATE and Gaussian noise on (x, y, yaw)
+CAR_RANGE = 25.0
+DRONE_RANGE = 35.0
+DETECTION_RATE = 0.85
+DETECTION_NOISE = np.array([0.2, 0.2, 0.03])
+
+# Car agents orbit the intersection by a fixed angle each frame (radians)
+AGENT_ANGLE_STEP = 0.015
+
 # Occluder (building) - blocks visibility
 OCCLUDER = {
     "id": "building_01",
@@ -84,7 +102,7 @@ BEATS = {
 # DATA CLASSES
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Vec3:
     x: float
     y: float
@@ -94,7 +112,7 @@ class Vec3:
         return {"x": self.x, "y": self.y, "z": self.z}
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectedObject:
     local_object_id: str
     obj_class: str
@@ -116,7 +134,7 @@ class DetectedObject:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectionPacket:
     frame: int
     timestamp_ns: int
@@ -126,7 +144,10 @@ class DetectionPacket:
     objects: List[DetectedObject]
 
     def to_ndjson(self):
-        return json.dumps({
+        return json.dumps(self.to_record())
+
+    def to_record(self) -> Dict:
+        return {
             "packet_type": "DETECTION",
             "frame": self.frame,
             "timestamp_ns": self.timestamp_ns,
@@ -134,10 +155,10 @@ class DetectionPacket:
             "delivery_frame": self.delivery_frame,
             "signature_valid": self.signature_valid,
             "objects": [o.to_dict() for o in self.objects],
-        })
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class CanonicalObject:
     canonical_object_id: str
     obj_class: str
@@ -160,37 +181,43 @@ class CanonicalObject:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class CanonicalState:
     frame: int
     timestamp_ns: int
     objects: List[CanonicalObject]
 
     def to_ndjson(self):
-        return json.dumps({
+        return json.dumps(self.to_record())
+
+    def to_record(self) -> Dict:
+        return {
             "packet_type": "CANONICAL_STATE",
             "frame": self.frame,
             "timestamp_ns": self.timestamp_ns,
             "objects": [o.to_dict() for o in self.objects],
-        })
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     frame: int
     event_type: str
     payload: Dict
 
     def to_ndjson(self):
-        return json.dumps({
+        return json.dumps(self.to_record())
+
+    def to_record(self) -> Dict:
+        return {
             "packet_type": "EVENT",
             "frame": self.frame,
             "event_type": self.event_type,
             "payload": self.payload,
-        })
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class Agent:
     agent_id: str
     x: float
@@ -201,6 +228,36 @@ class Agent:
     is_spoof: bool = False
 
 
+class NDJSONStream:
+    """Append-only NDJSON file; records (objects with to_record()) are written as they are produced."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._file = open(path, "wb", buffering=1 << 20)
+
+    def append(self, record) -> None:
+        if HAS_ORJSON:
+            self._file.write(orjson.dumps(record.to_record(), option=orjson.OPT_APPEND_NEWLINE))
+        else:
+            # Compact separators to match orjson's layout; parsed records are identical
+            self._file.write((json.dumps(record.to_record(), separators=(",", ":")) + "\n").encode())
+        self.count += 1
+
+    def extend(self, records) -> None:
+        for record in records:
+            self.append(record)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "NDJSONStream":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
 # =============================================================================
 # WORLD SIMULATION
 # =============================================================================
@@ -212,8 +269,9 @@ class WorldSimulator:
         self.duration_s = duration_s
         self.total_frames = fps * duration_s
         self.num_agents = num_agents
+        self._dt = 1.0 / fps
 
-        random.seed(seed)
+        self.rng = np.random.default_rng(seed)
 
         # Spoof config (needed before _init_agents)
         self.spoof_agent_id = "unknown_x"
@@ -222,29 +280,92 @@ class WorldSimulator:
         # Initialize agents
         self.agents: List[Agent] = []
         self._init_agents()
-
-        # Ground truth objects (copy so we can mutate positions)
-        self.gt_objects = [dict(o) for o in GT_OBJECTS]
+        self._cos_da = math.cos(AGENT_ANGLE_STEP)
+        self._sin_da = math.sin(AGENT_ANGLE_STEP)
+
+        # Occluder extents, for the line-of-sight test
+        self._occ_x0 = OCCLUDER["x"] - OCCLUDER["width"] / 2
+        self._occ_x1 = OCCLUDER["x"] + OCCLUDER["width"] / 2
+        self._occ_y0 = OCCLUDER["y"] - OCCLUDER["height"] / 2
+        self._occ_y1 = OCCLUDER["y"] + OCCLUDER["height"] / 2
+
+        # Ground truth objects: moving state as arrays, fixed attributes as lists
+        self.gt_ids = [o["id"] for o in GT_OBJECTS]
+        self.gt_classes = [o["class"] for o in GT_OBJECTS]
+        self.gt_x = np.array([o["x"] for o in GT_OBJECTS], dtype=np.float64)
+        self.gt_y = np.array([o["y"] for o in GT_OBJECTS], dtype=np.float64)
+        self.gt_z = np.array([o.get("z", 0) for o in GT_OBJECTS], dtype=np.float64)
+        self.gt_vx = np.array([o.get("vx", 0) for o in GT_OBJECTS], dtype=np.float64)
+        self.gt_vy = np.array([o.get("vy", 0) for o in GT_OBJECTS], dtype=np.float64)
+        self.gt_index = {gt_id: j for j, gt_id in enumerate(self.gt_ids)}
+
+        # Detection and canonical ids for every (agent, object) pair, built once
+        self.local_ids = [[f"{a.agent_id}_{gt_id}" for gt_id in self.gt_ids] for a in self.agents]
+        self.canonical_ids = [f"canonical_{gt_id}" for gt_id in self.gt_ids]
 
         # OOSM config
         self.oosm_agent = "agent_07"
         self.oosm_delay_frames = 12
         self.oosm_active_range = (int(55 * fps), int(62 * fps))
 
-        # Output buffers
-        self.packets: List[DetectionPacket] = []
-        self.world_states: List[CanonicalState] = []
-        self.events: List[Event] = []
+        # Phase and beat names per frame, looked up instead of recomputed
+        self.phase_by_frame = self._frame_table({
+            "hook": PHASE_HOOK,
+            "before": PHASE_BEFORE,
+            "after": PHASE_AFTER,
+            "montage": PHASE_MONTAGE,
+        }, default="close")
+        self.beat_by_frame = self._frame_table(
+            {name: (b["start"], b["end"]) for name, b in BEATS.items()}, default="general")
+
+        # One-shot events keyed by the frame they fire on
+        self.event_schedule: Dict[int, Tuple[str, Dict]] = {
+            int(42 * fps): ("MERGE", {
+                "from_ids": ["agent_02_car_target_01", "agent_03_car_target_01"],
+                "to_id": "canonical_car_target_01",
+                "reason": "highlander_min_uuid",
+            }),
+            int(52 * fps): ("TRUST_REJECT", {
+                "agent_id": self.spoof_agent_id,
+                "object_id": self.spoof_object_id,
+                "reason": "invalid_signature",
+            }),
+            int(59 * fps): ("OOSM_CORRECTED", {
+                "agent_id": self.oosm_agent,
+                "delayed_frames": self.oosm_delay_frames,
+            }),
+            int(65 * fps): ("SPACE_SEPARATION", {
+                "drone_id": "drone_00",
+                "car_id": "agent_03",
+                "delta_z": 15.0,
+            }),
+            # Causality
+            int(32 * fps): ("PACKET_ARRIVAL", {
+                "from_agent": "drone_00",
+                "to_agent": "agent_01",
+                "object_id": "ped_01",
+                "causes": "remote_observation",
+            }),
+        }
+
+        # Output streams, open while run() is simulating
+        self.packets: Optional[NDJSONStream] = None
+        self.world_states: Optional[NDJSONStream] = None
+        self.events: Optional[NDJSONStream] = None
 
     def _init_agents(self):
-        # Car agents in a ring around intersection
-        for i in range(self.num_agents):
-            angle = (2 * math.pi * i) / self.num_agents
-            radius = INTERSECTION_RADIUS * 0.8
-            x = radius * math.cos(angle)
-            y = radius * math.sin(angle)
-            yaw = angle + math.pi
-
+        # Car agents in a ring around intersection, then the drone at center.
+        # Positions are advanced as arrays; the Agent objects mirror them
+        n = self.num_agents
+        angles = np.linspace(0, 2 * math.pi, n, endpoint=False)
+        radius = INTERSECTION_RADIUS * 0.8
+        self.agent_x = np.append(radius * np.cos(angles), 0.0)
+        self.agent_y = np.append(radius * np.sin(angles), 0.0)
+        self.agent_yaw = np.append(angles + math.pi, 0.0)
+        self.is_drone = np.arange(n + 1) == n
+
+        for i, (x, y, yaw) in enumerate(zip(self.agent_x[:n].tolist(), self.agent_y[:n].tolist(),
+                                            self.agent_yaw[:n].tolist())):
             self.agents.append(Agent(
                 agent_id=f"agent_{i:02d}",
                 x=x, y=y, z=0,
@@ -252,7 +373,7 @@ class WorldSimulator:
                 is_drone=False,
             ))
 
-        # Drone at center, elevated
+        # Drone elevated
         self.agents.append(Agent(
             agent_id="drone_00",
             x=0, y=0, z=15.0,
@@ -268,118 +389,99 @@ class WorldSimulator:
             is_spoof=True,
         )
 
+        self.max_range_sq = np.where(self.is_drone, DRONE_RANGE**2, CAR_RANGE**2)
+        self.agent_index = {a.agent_id: i for i, a in enumerate(self.agents)}
+        self.agent_ids = np.array([a.agent_id for a in self.agents], dtype=object)
+
+    def _frame_table(self, spans: Dict[str, Tuple[float, float]], default: str) -> List[str]:
+        """Name of the first span (seconds, end-exclusive) covering each frame."""
+        table = [default] * self.total_frames
+        # Fill in reverse so earlier spans win where they overlap
+        for name, (start, end) in reversed(list(spans.items())):
+            lo = min(math.ceil(start * self.fps), self.total_frames)
+            hi = min(math.ceil(end * self.fps), self.total_frames)
+            table[lo:hi] = [name] * max(hi - lo, 0)
+        return table
+
     def get_phase(self, frame: int) -> str:
-        t = frame / self.fps
-        if PHASE_HOOK[0] <= t < PHASE_HOOK[1]:
-            return "hook"
-        elif PHASE_BEFORE[0] <= t < PHASE_BEFORE[1]:
-            return "before"
-        elif PHASE_AFTER[0] <= t < PHASE_AFTER[1]:
-            return "after"
-        elif PHASE_MONTAGE[0] <= t < PHASE_MONTAGE[1]:
-            return "montage"
-        else:
-            return "close"
+        return self.phase_by_frame[frame]
 
     def get_beat(self, frame: int) -> str:
-        t = frame / self.fps
-        for beat_name, beat_info in BEATS.items():
-            if beat_info["start"] <= t < beat_info["end"]:
-                return beat_name
-        return "general"
+        return self.beat_by_frame[frame]
 
     def _update_positions(self, frame: int):
-        dt = 1.0 / self.fps
-
-        # Update agents (circular motion)
-        for agent in self.agents:
-            if not agent.is_drone:
-                angle_speed = 0.015
-                current_angle = math.atan2(agent.y, agent.x)
-                new_angle = current_angle + angle_speed
-                radius = math.sqrt(agent.x**2 + agent.y**2)
-                agent.x = radius * math.cos(new_angle)
-                agent.y = radius * math.sin(new_angle)
-                agent.yaw = new_angle + math.pi
-            else:
-                # Drone gentle drift
-                agent.x = 2 * math.sin(frame * 0.02)
-                agent.y = 2 * math.cos(frame * 0.02)
+        dt = self._dt
+
+        # Update agents (circular motion): a fixed-angle rotation about the
+        # intersection, so every car keeps its radius
+        cars, drones = ~self.is_drone, self.is_drone
+        ax, ay = self.agent_x, self.agent_y
+        nx = ax * self._cos_da - ay * self._sin_da
+        ny = ax * self._sin_da + ay * self._cos_da
+        ax[cars] = nx[cars]
+        ay[cars] = ny[cars]
+        self.agent_yaw[cars] += AGENT_ANGLE_STEP
+
+        # Drone gentle drift
+        ax[drones] = 2 * math.sin(frame * 0.02)
+        ay[drones] = 2 * math.cos(frame * 0.02)
+
+        for agent, x, y, yaw in zip(self.agents, ax.tolist(), ay.tolist(),
+                                    self.agent_yaw.tolist()):
+            agent.x, agent.y, agent.yaw = x, y, yaw
 
         # Update ground truth objects
-        for obj in self.gt_objects:
-            obj["x"] += obj.get("vx", 0) * dt
-            obj["y"] += obj.get("vy", 0) * dt
-            # Wrap around if too far
-            if abs(obj["x"]) > 40:
-                obj["vx"] *= -1
-            if abs(obj["y"]) > 40:
-                obj["vy"] *= -1
+        self.gt_x += self.gt_vx * dt
+        self.gt_y += self.gt_vy * dt
+        # Wrap around if too far
+        self.gt_vx[np.abs(self.gt_x) > 40] *= -1
+        self.gt_vy[np.abs(self.gt_y) > 40] *= -1
 
     def _is_occluded(self, agent: Agent, obj_x: float, obj_y: float) -> bool:
         """Check if object is occluded by building from agent's view."""
         if agent.is_drone:
             return False  # Drone sees from above
 
-        # Simple box occlusion check
-        occ = OCCLUDER
-        bx, by = occ["x"], occ["y"]
-        bw, bh = occ["width"], occ["height"]
-
-        # Check if line from agent to object passes through occluder
         ax, ay = agent.x, agent.y
-
-        # Parametric line: P = A + t*(O - A)
         dx, dy = obj_x - ax, obj_y - ay
-        dist = math.sqrt(dx*dx + dy*dy)
-        if dist < 0.1:
+        if dx*dx + dy*dy < 0.01:
             return False
 
-        # Check intersection with box
-        for t in [i * 0.1 for i in range(1, 10)]:
-            px = ax + t * dx
-            py = ay + t * dy
-            if (bx - bw/2 <= px <= bx + bw/2) and (by - bh/2 <= py <= by + bh/2):
-                return True
-        return False
+        # Slab test: clip the segment A + t*(O - A), t in [0, 1], against
+        # the occluder's x and y extents; it hits iff some t survives both
+        t_lo, t_hi = 0.0, 1.0
+        for start, delta, lo, hi in ((ax, dx, self._occ_x0, self._occ_x1),
+                                     (ay, dy, self._occ_y0, self._occ_y1)):
+            if delta == 0:
+                if not lo <= start <= hi:
+                    return False
+                continue
+            t1 = (lo - start) / delta
+            t2 = (hi - start) / delta
+            if t1 > t2:
+                t1, t2 = t2, t1
+            t_lo = max(t_lo, t1)
+            t_hi = min(t_hi, t2)
+        return t_lo <= t_hi
+
+    def _visibility(self, phase: str, beat: str) -> np.ndarray:
+        """Boolean (agents, objects) mask of which agent can see which object."""
+        dx = self.agent_x[:, None] - self.gt_x[None, :]
+        dy = self.agent_y[:, None] - self.gt_y[None, :]
 
-    def _agent_can_see(self, agent: Agent, obj: Dict, phase: str, beat: str) -> bool:
-        """Determine if agent can see the object."""
-        obj_x, obj_y = obj["x"], obj["y"]
+        # Distance check (agents can see ~30m)
+        visible = dx * dx + dy * dy <= self.max_range_sq[:, None]
 
         # During occlusion beat in BEFORE phase, agent_01 cannot see ped_01
         if beat == "occlusion" and phase == "before":
-            if agent.agent_id == "agent_01" and obj["id"] == "ped_01":
-                if self._is_occluded(agent, obj_x, obj_y):
-                    return False
+            i = self.agent_index.get("agent_01")
+            j = self.gt_index["ped_01"]
+            if i is not None and self._is_occluded(self.agents[i], self.gt_x[j], self.gt_y[j]):
+                visible[i, j] = False
 
-        # Distance check (agents can see ~30m)
-        dist = math.sqrt((agent.x - obj_x)**2 + (agent.y - obj_y)**2)
-        max_range = 35 if agent.is_drone else 25
-        if dist > max_range:
-            return False
+        return visible
 
-        return True
-
-    def _generate_detection(self, agent: Agent, obj: Dict, local_id: str) -> DetectedObject:
-        noise_x = random.gauss(0, 0.2)
-        noise_y = random.gauss(0, 0.2)
-        noise_yaw = random.gauss(0, 0.03)
-
-        return DetectedObject(
-            local_object_id=local_id,
-            obj_class=obj["class"],
-            x=obj["x"] + noise_x,
-            y=obj["y"] + noise_y,
-            z=obj.get("z", 0),
-            yaw=noise_yaw,
-            covariance=[0.4, 0.0, 0.0, 0.4],
-            vx=obj.get("vx", 0),
-            vy=obj.get("vy", 0),
-        )
-
-    def _generate_spoof_packet(self, frame: int) -> DetectionPacket:
-        timestamp_ns = int((frame / self.fps) * 1e9)
+    def _generate_spoof_packet(self, frame: int, timestamp_ns: int) -> DetectionPacket:
         fake_bus = DetectedObject(
             local_object_id=self.spoof_object_id,
             obj_class="bus",
@@ -399,23 +501,39 @@ class WorldSimulator:
     def simulate_frame(self, frame: int):
         phase = self.get_phase(frame)
         beat = self.get_beat(frame)
-        timestamp_ns = int((frame / self.fps) * 1e9)
+        # Exact integer time, so no frame rounds down a nanosecond
+        timestamp_ns = frame * 1_000_000_000 // self.fps
 
         self._update_positions(frame)
 
         frame_packets: List[DetectionPacket] = []
 
-        # Generate per-agent detections
-        for agent in self.agents:
-            objects_seen: List[DetectedObject] = []
-
-            for obj in self.gt_objects:
-                if self._agent_can_see(agent, obj, phase, beat):
-                    if random.random() < 0.85:  # 85% detection rate
-                        local_id = f"{agent.agent_id}_{obj['id']}"
-                        det = self._generate_detection(agent, obj, local_id)
-                        objects_seen.append(det)
+        # Generate per-agent detections: draw the detection rolls and the
+        # noise for every (agent, object) pair at once, keep the detected ones
+        visible = self._visibility(phase, beat)
+        detected = visible & (self.rng.random(visible.shape) < DETECTION_RATE)
+        noise = self.rng.standard_normal(visible.shape + (3,)) * DETECTION_NOISE
+
+        # Detected pairs in agent order, as parallel arrays
+        agent_idx, gt_idx = np.nonzero(detected)
+        det_x = self.gt_x[gt_idx] + noise[agent_idx, gt_idx, 0]
+        det_y = self.gt_y[gt_idx] + noise[agent_idx, gt_idx, 1]
+        det_yaw = noise[agent_idx, gt_idx, 2]
+        gt_z, gt_vx, gt_vy = self.gt_z.tolist(), self.gt_vx.tolist(), self.gt_vy.tolist()
+
+        objects_seen: List[List[DetectedObject]] = [[] for _ in self.agents]
+        for i, j, x, y, yaw in zip(agent_idx.tolist(), gt_idx.tolist(), det_x.tolist(),
+                                   det_y.tolist(), det_yaw.tolist()):
+            objects_seen[i].append(DetectedObject(
+                local_object_id=self.local_ids[i][j],
+                obj_class=self.gt_classes[j],
+                x=x, y=y, z=gt_z[j],
+                yaw=yaw,
+                covariance=[0.4, 0.0, 0.0, 0.4],
+                vx=gt_vx[j], vy=gt_vy[j],
+            ))
 
+        for agent, objects in zip(self.agents, objects_seen):
             # OOSM delay for agent_07
             delivery_frame = frame
             if agent.agent_id == self.oosm_agent:
@@ -428,19 +546,21 @@ class WorldSimulator:
                 agent_id=agent.agent_id,
                 delivery_frame=delivery_frame,
                 signature_valid=True,
-                objects=objects_seen,
+                objects=objects,
             )
             frame_packets.append(packet)
 
         # Spoof packets during spoof beat
+        spoof_packets: List[DetectionPacket] = []
         if beat in ["spoof", "trust_reject"]:
-            spoof_pkt = self._generate_spoof_packet(frame)
-            frame_packets.append(spoof_pkt)
+            spoof_packets.append(self._generate_spoof_packet(frame, timestamp_ns))
+        frame_packets.extend(spoof_packets)
 
         self.packets.extend(frame_packets)
 
         # Generate canonical state
-        canonical_objects = self._fuse_to_canonical(frame_packets, frame, phase)
+        canonical_objects = self._fuse_to_canonical(
+            detected, gt_idx, det_x, det_y, det_yaw, spoof_packets, phase)
         self.world_states.append(CanonicalState(
             frame=frame,
             timestamp_ns=timestamp_ns,
@@ -448,142 +568,89 @@ class WorldSimulator:
         ))
 
         # Generate events
-        self._generate_events(frame, beat, phase)
+        self._generate_events(frame)
+
+    def _fuse_to_canonical(self, detected: np.ndarray, gt_idx: np.ndarray,
+                           det_x: np.ndarray, det_y: np.ndarray, det_yaw: np.ndarray,
+                           spoof_packets: List[DetectionPacket], phase: str) -> List[CanonicalObject]:
+        """Average each object's detections into one canonical object.
+
+        The agents' detections come in as parallel arrays keyed by gt_idx
+        and are reduced per ground-truth object with bincount; each column
+        of the (agents, objects) detected mask is that object's set of
+        source agents. Spoof packets are fused on their own, until the
+        AFTER phases start rejecting their invalid signatures.
+        """
+        n_objs = len(self.gt_ids)
+        counts = np.bincount(gt_idx, minlength=n_objs)
+        sum_x = np.bincount(gt_idx, weights=det_x, minlength=n_objs)
+        sum_y = np.bincount(gt_idx, weights=det_y, minlength=n_objs)
+        sum_z = np.bincount(gt_idx, weights=self.gt_z[gt_idx], minlength=n_objs)
+        sum_yaw = np.bincount(gt_idx, weights=det_yaw, minlength=n_objs)
+
+        seen = np.flatnonzero(counts)
+        n = counts[seen]
+        fused_cov = 0.4 / np.sqrt(n)
+        confidence = np.minimum(0.99, 0.5 + 0.1 * n)
 
-    def _fuse_to_canonical(self, packets: List[DetectionPacket], frame: int, phase: str) -> List[CanonicalObject]:
-        obj_observations: Dict[str, List[Tuple[str, DetectedObject]]] = {}
+        canonical_objects: List[CanonicalObject] = []
+        for j, x, y, z, yaw, cov, conf in zip(
+                seen.tolist(), (sum_x[seen] / n).tolist(), (sum_y[seen] / n).tolist(),
+                (sum_z[seen] / n).tolist(), (sum_yaw[seen] / n).tolist(),
+                fused_cov.tolist(), confidence.tolist()):
+            canonical_objects.append(CanonicalObject(
+                canonical_object_id=self.canonical_ids[j],
+                obj_class=self.gt_classes[j],
+                x=x, y=y, z=z,
+                yaw=yaw,
+                covariance=[cov, 0, 0, cov],
+                source_agents=self.agent_ids[detected[:, j]].tolist(),
+                confidence=conf,
+            ))
 
-        for pkt in packets:
+        for pkt in spoof_packets:
             # Skip invalid signatures in AFTER phase
             if phase in ["after", "montage", "close"] and not pkt.signature_valid:
                 continue
-
             for det in pkt.objects:
-                parts = det.local_object_id.split("_", 2)
-                if len(parts) >= 3:
-                    gt_id = "_".join(parts[2:])
-                else:
-                    gt_id = det.local_object_id
-
-                if gt_id not in obj_observations:
-                    obj_observations[gt_id] = []
-                obj_observations[gt_id].append((pkt.agent_id, det))
-
-        canonical_objects: List[CanonicalObject] = []
-        for gt_id, observations in obj_observations.items():
-            if not observations:
-                continue
-
-            avg_x = sum(o[1].x for o in observations) / len(observations)
-            avg_y = sum(o[1].y for o in observations) / len(observations)
-            avg_z = sum(o[1].z for o in observations) / len(observations)
-            avg_yaw = sum(o[1].yaw for o in observations) / len(observations)
-
-            fused_cov = 0.4 / math.sqrt(len(observations))
-            source_agents = list(set(o[0] for o in observations))
-
-            canonical_objects.append(CanonicalObject(
-                canonical_object_id=f"canonical_{gt_id}",
-                obj_class=observations[0][1].obj_class,
-                x=avg_x, y=avg_y, z=avg_z,
-                yaw=avg_yaw,
-                covariance=[fused_cov, 0, 0, fused_cov],
-                source_agents=source_agents,
-                confidence=min(0.99, 0.5 + 0.1 * len(observations)),
-            ))
+                canonical_objects.append(CanonicalObject(
+                    canonical_object_id=f"canonical_{det.local_object_id}",
+                    obj_class=det.obj_class,
+                    x=det.x, y=det.y, z=det.z,
+                    yaw=det.yaw,
+                    covariance=[0.4, 0, 0, 0.4],
+                    source_agents=[pkt.agent_id],
+                    confidence=0.6,
+                ))
 
         return canonical_objects
 
-    def _generate_events(self, frame: int, beat: str, phase: str):
-        # MERGE event
-        if beat == "merge" and frame == int(42 * self.fps):
-            self.events.append(Event(
-                frame=frame,
-                event_type="MERGE",
-                payload={
-                    "from_ids": ["agent_02_car_target_01", "agent_03_car_target_01"],
-                    "to_id": "canonical_car_target_01",
-                    "reason": "highlander_min_uuid",
-                }
-            ))
-
-        # TRUST_REJECT event
-        if beat == "trust_reject" and frame == int(52 * self.fps):
-            self.events.append(Event(
-                frame=frame,
-                event_type="TRUST_REJECT",
-                payload={
-                    "agent_id": self.spoof_agent_id,
-                    "object_id": self.spoof_object_id,
-                    "reason": "invalid_signature",
-                }
-            ))
-
-        # OOSM event
-        if beat == "oosm" and frame == int(59 * self.fps):
-            self.events.append(Event(
-                frame=frame,
-                event_type="OOSM_CORRECTED",
-                payload={
-                    "agent_id": self.oosm_agent,
-                    "delayed_frames": self.oosm_delay_frames,
-                }
-            ))
-
-        # SPACE_SEPARATION event
-        if beat == "space" and frame == int(65 * self.fps):
-            self.events.append(Event(
-                frame=frame,
-                event_type="SPACE_SEPARATION",
-                payload={
-                    "drone_id": "drone_00",
-                    "car_id": "agent_03",
-                    "delta_z": 15.0,
-                }
-            ))
+    def _generate_events(self, frame: int):
+        scheduled = self.event_schedule.get(frame)
+        if scheduled is not None:
+            event_type, payload = scheduled
+            self.events.append(Event(frame=frame, event_type=event_type, payload=payload))
 
-        # PACKET_ARRIVAL events (causality)
-        if beat == "remote_obs" and frame == int(32 * self.fps):
-            self.events.append(Event(
-                frame=frame,
-                event_type="PACKET_ARRIVAL",
-                payload={
-                    "from_agent": "drone_00",
-                    "to_agent": "agent_01",
-                    "object_id": "ped_01",
-                    "causes": "remote_observation",
-                }
-            ))
-
-    def run(self):
+    def run(self, out_dir: str):
+        """Simulate every frame, streaming packets, states and events to out_dir."""
+        os.makedirs(out_dir, exist_ok=True)
         print(f"Simulating {self.total_frames} frames ({self.duration_s}s at {self.fps} FPS)...")
-        for frame in range(self.total_frames):
-            self.simulate_frame(frame)
-            if frame % (self.fps * 10) == 0:
-                print(f"  Frame {frame}/{self.total_frames} ({frame/self.fps:.0f}s)")
+        with NDJSONStream(os.path.join(out_dir, "packets.ndjson")) as self.packets, \
+                NDJSONStream(os.path.join(out_dir, "world_state.ndjson")) as self.world_states, \
+                NDJSONStream(os.path.join(out_dir, "events.ndjson")) as self.events:
+            for frame in range(self.total_frames):
+                self.simulate_frame(frame)
+                if frame % (self.fps * 10) == 0:
+                    print(f"  Frame {frame}/{self.total_frames} ({frame/self.fps:.0f}s)")
         print("Simulation complete.")
 
+        print(f"Wrote {self.packets.count} packets to {self.packets.path}")
+        print(f"Wrote {self.world_states.count} states to {self.world_states.path}")
+        print(f"Wrote {self.events.count} events to {self.events.path}")
+
     def write_output(self, out_dir: str):
         os.makedirs(out_dir, exist_ok=True)
 
-        packets_path = os.path.join(out_dir, "packets.ndjson")
-        with open(packets_path, "w") as f:
-            for pkt in self.packets:
-                f.write(pkt.to_ndjson() + "\n")
-        print(f"Wrote {len(self.packets)} packets to {packets_path}")
-
-        state_path = os.path.join(out_dir, "world_state.ndjson")
-        with open(state_path, "w") as f:
-            for state in self.world_states:
-                f.write(state.to_ndjson() + "\n")
-        print(f"Wrote {len(self.world_states)} states to {state_path}")
-
-        events_path = os.path.join(out_dir, "events.ndjson")
-        with open(events_path, "w") as f:
-            for evt in self.events:
-                f.write(evt.to_ndjson() + "\n")
-        print(f"Wrote {len(self.events)} events to {events_path}")
-
         # Write beat config for renderer
         beats_path = os.path.join(out_dir, "beats.json")
         with open(beats_path, "w") as f:
@@ -618,7 +685,7 @@ def main():
         duration_s=args.duration_s,
         num_agents=args.num_agents,
     )
-    sim.run()
+    sim.run(args.out)
     sim.write_output(args.out)
 
     print("=" * 60)
@@ -11,20 +11,35 @@ Renders frames with:
 - Agent spotlight panel
 - Event visualizations (merge pulse, trust reject shield, OOSM tag)
 
-Output: out/frames/frame_XXXXX.png
+Output: out/final_godview_demo_fixed.mp4 (frames piped to ffmpeg),
+        or out/frames/frame_XXXXX.png with --png
 """
 
 import argparse
+import bisect
+import heapq
 import json
 import math
 import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Set
 
 import cv2
 import numpy as np
 
+# Optional fast JSON decoder for the NDJSON logs
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -81,6 +96,10 @@ NODE_RING_RADIUS = 160
 # Object budget
 MAX_OBJECTS_VISIBLE = 12
 SPOTLIGHT_ZONE_RADIUS = 15.0  # meters
+BOOSTED_CLASSES = frozenset(("pedestrian", "cyclist"))
+
+# Object box corners as fractions of (length, width), before rotation
+BOX_CORNERS = np.array([(-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5)])
 
 # Captions per beat
 CAPTIONS = {
@@ -102,6 +121,13 @@ CAPTIONS = {
 # DATA LOADING
 # =============================================================================
 
+def read_ndjson(path: Path) -> List[Dict]:
+    """Parse every record of an NDJSON file, with orjson when installed."""
+    loads = orjson.loads if HAS_ORJSON else json.loads
+    with open(path, "rb") as f:
+        return [loads(line) for line in f.read().splitlines() if line]
+
+
 @dataclass
 class FrameData:
     frame: int
@@ -122,9 +148,9 @@ class DataLoader:
         self.fps = fps
         self.out_dir = out_dir
 
-        self.packets_by_frame: Dict[int, List[Dict]] = {}
+        self.packets_by_frame: Dict[int, List[Dict]] = defaultdict(list)
         self.states_by_frame: Dict[int, Dict] = {}
-        self.events_by_frame: Dict[int, List[Dict]] = {}
+        self.events_by_frame: Dict[int, List[Dict]] = defaultdict(list)
         self.all_events: List[Dict] = []
         self.beats: Dict = {}
         self.occluder: Dict = {}
@@ -134,29 +160,21 @@ class DataLoader:
 
     def _load_all(self):
         # Load packets
-        with open(self.out_dir / "packets.ndjson") as f:
-            for line in f:
-                pkt = json.loads(line)
-                frame = pkt["frame"]
-                if frame not in self.packets_by_frame:
-                    self.packets_by_frame[frame] = []
-                self.packets_by_frame[frame].append(pkt)
+        for pkt in read_ndjson(self.out_dir / "packets.ndjson"):
+            self.packets_by_frame[pkt["frame"]].append(pkt)
 
         # Load states
-        with open(self.out_dir / "world_state.ndjson") as f:
-            for line in f:
-                state = json.loads(line)
-                self.states_by_frame[state["frame"]] = state
+        for state in read_ndjson(self.out_dir / "world_state.ndjson"):
+            self.states_by_frame[state["frame"]] = state
 
         # Load events
-        with open(self.out_dir / "events.ndjson") as f:
-            for line in f:
-                evt = json.loads(line)
-                frame = evt["frame"]
-                if frame not in self.events_by_frame:
-                    self.events_by_frame[frame] = []
-                self.events_by_frame[frame].append(evt)
-                self.all_events.append(evt)
+        for evt in read_ndjson(self.out_dir / "events.ndjson"):
+            self.events_by_frame[evt["frame"]].append(evt)
+            self.all_events.append(evt)
+
+        # Events in frame order, so any frame's history is a prefix slice
+        self.all_events.sort(key=lambda e: e["frame"])
+        self.event_frames = [e["frame"] for e in self.all_events]
 
         # Load beats
         with open(self.out_dir / "beats.json") as f:
@@ -201,7 +219,7 @@ class DataLoader:
             is_split = ss_start <= t < ss_end
 
         state = self.states_by_frame.get(frame, {"objects": []})
-        events_up_to_now = [e for e in self.all_events if e["frame"] <= frame]
+        events_up_to_now = self.all_events[:bisect.bisect_right(self.event_frames, frame)]
 
         return FrameData(
             frame=frame,
@@ -235,12 +253,26 @@ class DemoRenderer:
         self.agent_colors: Dict[str, Tuple[int, int, int]] = {}
         self._init_agent_colors()
 
-        # Recent events for log
-        self.recent_events: List[Tuple[int, str]] = []
-
         # Causality arrow state
         self.causality_arrows: List[Dict] = []
 
+        # Static layers, drawn once and copied at the start of each frame
+        self._world_bg = self._build_world_bg()
+        self._inset_region, self._inset_patch, self._inset_mask = self._build_inset()
+        self._network_bg = self._build_network_bg()
+        self._data_bg, self._data_log_y = self._build_data_bg()
+
+        # Output buffers reused for every frame; the panes are drawn straight into
+        # views of the frame canvas, which together cover it completely
+        self._canvas = np.empty((HEIGHT, WIDTH, 3), dtype=np.uint8)
+        self._before = np.empty((WORLD_PANE_H, WORLD_PANE_W, 3), dtype=np.uint8)
+
+        # Last rendered network/data pane and the inputs it was drawn from
+        self._network_key: Optional[Tuple] = None
+        self._network_last = np.empty((NETWORK_PANE_H, NETWORK_PANE_W, 3), dtype=np.uint8)
+        self._data_key: Optional[Tuple] = None
+        self._data_last = np.empty((HEIGHT - NETWORK_PANE_H, DATA_PANE_W, 3), dtype=np.uint8)
+
     def _init_agent_positions(self):
         agents = [f"agent_{i:02d}" for i in range(20)] + ["drone_00", "unknown_x"]
         for i, agent_id in enumerate(agents):
@@ -259,17 +291,100 @@ class DemoRenderer:
             self.agent_colors[agent_id] = base_colors[i % len(base_colors)]
         self.agent_colors["unknown_x"] = COLOR_SPOOF
 
+    def _build_world_bg(self) -> np.ndarray:
+        """World pane grid and occluder."""
+        canvas = np.full((WORLD_PANE_H, WORLD_PANE_W, 3), BG_COLOR, dtype=np.uint8)
+        self.draw_grid(canvas)
+        self.draw_occluder(canvas, self.data.occluder)
+        return canvas
+
+    def _draw_inset(self, canvas: np.ndarray):
+        cv2.rectangle(canvas, (INSET_X, INSET_Y), (INSET_X + INSET_W, INSET_Y + INSET_H), (30, 30, 30), -1)
+        cv2.rectangle(canvas, (INSET_X, INSET_Y), (INSET_X + INSET_W, INSET_Y + INSET_H), (60, 60, 60), 2)
+        cv2.putText(canvas, "3D INSET (local sensors)", (INSET_X + 10, INSET_Y + 20), FONT, 0.4, (80, 80, 80), 1)
+        cv2.putText(canvas, "LiDAR stays local", (INSET_X + 30, INSET_Y + INSET_H // 2), FONT, 0.5, (100, 100, 100), 1)
+
+    def _build_inset(self) -> Tuple[Tuple[slice, slice], np.ndarray, np.ndarray]:
+        """3D inset placeholder as a patch plus the mask of pixels it covers.
+
+        The inset is drawn over the objects, so it is pasted per frame rather
+        than baked into the background. Drawing it on black and on white
+        shows which pixels it owns.
+        """
+        black = np.zeros((WORLD_PANE_H, WORLD_PANE_W, 3), dtype=np.uint8)
+        white = np.full_like(black, 255)
+        self._draw_inset(black)
+        self._draw_inset(white)
+        covered = (black == white).all(axis=2)
+        ys, xs = np.nonzero(covered)
+        region = (slice(ys.min(), ys.max() + 1), slice(xs.min(), xs.max() + 1))
+        return region, black[region], covered[region][..., None]
+
+    def _build_network_bg(self) -> np.ndarray:
+        """Network pane spokes, idle nodes and title."""
+        canvas = np.full((NETWORK_PANE_H, NETWORK_PANE_W, 3), BG_COLOR, dtype=np.uint8)
+        spokes = np.array([(pos, NETWORK_CENTER) for agent_id, pos in self.agent_positions.items()
+                           if agent_id != "unknown_x"], dtype=np.int32)
+        cv2.polylines(canvas, spokes, False, GRID_COLOR, 1)
+
+        # Every node as a ring; spotlight nodes are drawn filled over theirs each frame
+        for agent_id, pos in self.agent_positions.items():
+            color = COLOR_SPOOF if agent_id == "unknown_x" else COLOR_DIM
+            cv2.circle(canvas, pos, NODE_RADIUS, color, 2)
+
+        cv2.putText(canvas, "NETWORK", (10, 25), FONT, 0.5, COLOR_WHITE, 1)
+        return canvas
+
+    def _build_data_bg(self) -> Tuple[np.ndarray, int]:
+        """Data pane's fixed text; also returns where the event log starts."""
+        canvas = np.full((DATA_PANE_H, DATA_PANE_W, 3), BG_COLOR, dtype=np.uint8)
+
+        # Title
+        cv2.putText(canvas, "SHARED vs NOT SHARED", (10, 25), FONT, 0.5, COLOR_WHITE, 1)
+
+        # Shared section
+        y = 60
+        cv2.putText(canvas, "SHARED:", (20, y), FONT, 0.5, COLOR_AFTER, 1)
+        y += 28
+        shared = ["class (car, ped...)", "pose (x, y, z, yaw)", "covariance (2x2)",
+                  "timestamp", "signature"]
+        for field in shared:
+            cv2.putText(canvas, f"  [check] {field}", (20, y), FONT, 0.4, COLOR_AFTER, 1)
+            y += 22
+
+        # Not shared
+        y += 20
+        cv2.putText(canvas, "NOT SHARED:", (20, y), FONT, 0.5, COLOR_BEFORE, 1)
+        y += 28
+        not_shared = ["camera frames", "LiDAR point cloud", "video stream"]
+        for field in not_shared:
+            cv2.putText(canvas, f"  [X] {field}", (20, y), FONT, 0.4, COLOR_BEFORE, 1)
+            y += 22
+
+        # Event log header
+        y += 30
+        cv2.putText(canvas, "EVENTS:", (20, y), FONT, 0.5, COLOR_WHITE, 1)
+        y += 25
+
+        return canvas, y
+
     def world_to_screen(self, x: float, y: float) -> Tuple[int, int]:
         sx = int(WORLD_CENTER[0] + x * WORLD_SCALE)
         sy = int(WORLD_CENTER[1] - y * WORLD_SCALE)
         return (sx, sy)
 
+    def world_to_screen_array(self, xy: np.ndarray) -> np.ndarray:
+        """Vectorized world_to_screen: float (N, 2) metres -> int32 (N, 2) pixels."""
+        screen = np.empty(xy.shape, dtype=np.int32)
+        screen[:, 0] = WORLD_CENTER[0] + xy[:, 0] * WORLD_SCALE
+        screen[:, 1] = WORLD_CENTER[1] - xy[:, 1] * WORLD_SCALE
+        return screen
+
     def draw_grid(self, canvas: np.ndarray):
+        # Axis-aligned 1px lines: two strided stores instead of one cv2.line per line
         spacing = int(5 * WORLD_SCALE)
-        for x in range(0, WORLD_PANE_W, spacing):
-            cv2.line(canvas, (x, 0), (x, WORLD_PANE_H), GRID_COLOR, 1)
-        for y in range(0, WORLD_PANE_H, spacing):
-            cv2.line(canvas, (0, y), (WORLD_PANE_W, y), GRID_COLOR, 1)
+        canvas[:, 0:WORLD_PANE_W:spacing] = GRID_COLOR
+        canvas[0:WORLD_PANE_H:spacing, :] = GRID_COLOR
 
     def draw_occluder(self, canvas: np.ndarray, occ: Dict):
         """Draw the building/occluder."""
@@ -280,60 +395,97 @@ class DemoRenderer:
         cv2.rectangle(canvas, (cx - w//2, cy - h//2), (cx + w//2, cy + h//2), (80, 80, 100), 2)
         cv2.putText(canvas, "BUILDING", (cx - 30, cy), FONT, 0.4, (100, 100, 120), 1)
 
-    def draw_object_box(self, canvas: np.ndarray, obj: Dict, color: Tuple[int, int, int],
-                        thickness: int = 2, label: str = "", size: float = 2.0):
-        pos = obj["pose"]["position"]
-        cx, cy = self.world_to_screen(pos["x"], pos["y"])
-        yaw = obj["pose"].get("yaw", 0)
-
-        w = int(size * WORLD_SCALE)
-        h = int(size * 0.5 * WORLD_SCALE)
-
-        cos_a, sin_a = math.cos(yaw), math.sin(yaw)
-        corners = [(-w/2, -h/2), (w/2, -h/2), (w/2, h/2), (-w/2, h/2)]
-        rotated = []
-        for dx, dy in corners:
-            rx = dx * cos_a - dy * sin_a
-            ry = dx * sin_a + dy * cos_a
-            rotated.append((int(cx + rx), int(cy - ry)))
-
-        pts = np.array(rotated, np.int32).reshape((-1, 1, 2))
-        cv2.polylines(canvas, [pts], True, color, thickness)
+    def object_outlines(self, objects: List[Dict],
+                        size: float = 2.0) -> Tuple[List[Tuple[int, int]], np.ndarray]:
+        """Screen centres and rotated box outlines for a batch of objects.
+
+        The corners of every box are rotated in one NumPy pass; outlines is
+        an int32 (N, 4, 2) array ready for cv2.polylines.
+        """
+        positions = [o["pose"]["position"] for o in objects]
+        xy = np.array([(p["x"], p["y"]) for p in positions], dtype=np.float64).reshape(-1, 2)
+        screen = self.world_to_screen_array(xy)
+        centers = list(map(tuple, screen.tolist()))
+        yaws = np.array([o["pose"].get("yaw", 0) for o in objects], dtype=np.float64)[:, None]
+        cos_a, sin_a = np.cos(yaws), np.sin(yaws)
+
+        dx = BOX_CORNERS[:, 0] * int(size * WORLD_SCALE)
+        dy = BOX_CORNERS[:, 1] * int(size * 0.5 * WORLD_SCALE)
+        origin = screen.astype(np.float64)
+
+        outlines = np.empty((len(objects), 4, 2), dtype=np.int32)
+        outlines[..., 0] = origin[:, 0:1] + (dx * cos_a - dy * sin_a)
+        outlines[..., 1] = origin[:, 1:2] - (dx * sin_a + dy * cos_a)
+        return centers, outlines
+
+    def draw_object_boxes(self, canvas: np.ndarray, centers: List[Tuple[int, int]],
+                          outlines: np.ndarray, colors: List[Tuple[int, int, int]],
+                          thickness: int = 2, labels: Optional[List[str]] = None):
+        """Draw box outlines with one cv2.polylines call per colour, then their labels on top."""
+        # Cull boxes that lie entirely outside the canvas (a thick line reaches
+        # at most `thickness` pixels past its outline)
+        h, w = canvas.shape[:2]
+        lo, hi = outlines.min(axis=1), outlines.max(axis=1)
+        visible = ((hi[:, 0] >= -thickness) & (lo[:, 0] < w + thickness) &
+                   (hi[:, 1] >= -thickness) & (lo[:, 1] < h + thickness)).tolist()
+
+        by_color: Dict[Tuple[int, int, int], List[np.ndarray]] = defaultdict(list)
+        for outline, color, seen in zip(outlines, colors, visible):
+            if seen:
+                by_color[color].append(outline)
+        for color, pts in by_color.items():
+            cv2.polylines(canvas, pts, True, color, thickness)
+
+        if labels:
+            put_text = cv2.putText
+            for (cx, cy), color, label in zip(centers, colors, labels):
+                if label:
+                    put_text(canvas, label, (cx - 20, cy - 15), FONT, 0.35, color, 1)
+
+    def draw_covariance(self, canvas: np.ndarray, center: Tuple[int, int], obj: Dict,
+                        color: Tuple[int, int, int]):
+        cx, cy = center
+        cov = obj.get("covariance", [0.5, 0, 0, 0.5])
 
-        if label:
-            cv2.putText(canvas, label, (cx - 20, cy - 15), FONT, 0.35, color, 1)
+        sigma_x = int(max(0.3, math.sqrt(abs(cov[0]))) * WORLD_SCALE * 2)
+        sigma_y = int(max(0.3, math.sqrt(abs(cov[3]))) * WORLD_SCALE * 2)
 
-    def draw_covariance(self, canvas: np.ndarray, obj: Dict, color: Tuple[int, int, int]):
-        pos = obj["pose"]["position"]
-        cx, cy = self.world_to_screen(pos["x"], pos["y"])
-        cov = obj.get("covariance", [0.5, 0, 0, 0.5])
+        # Nothing to draw if the ellipse lies entirely off the canvas
+        h, w = canvas.shape[:2]
+        if cx + sigma_x < -1 or cx - sigma_x > w or cy + sigma_y < -1 or cy - sigma_y > h:
+            return
 
-        sigma_x = max(0.3, math.sqrt(abs(cov[0]))) * WORLD_SCALE * 2
-        sigma_y = max(0.3, math.sqrt(abs(cov[3]))) * WORLD_SCALE * 2
+        cv2.ellipse(canvas, (cx, cy), (sigma_x, sigma_y), 0, 0, 360, color, 1)
 
-        cv2.ellipse(canvas, (cx, cy), (int(sigma_x), int(sigma_y)), 0, 0, 360, color, 1)
+    def rank_objects(self, items: Iterable[Tuple[Dict, str, bool]],
+                     spotlight_agents: List[str]) -> List[Tuple[Dict, str, bool]]:
+        """Rank (object, sender, signature_valid) entries by importance and return top N."""
+        sqrt = math.sqrt
+        zone_sq = SPOTLIGHT_ZONE_RADIUS * SPOTLIGHT_ZONE_RADIUS
+        boosted = BOOSTED_CLASSES
 
-    def rank_objects(self, objects: List[Dict], spotlight_agents: List[str]) -> List[Dict]:
-        """Rank objects by importance and return top N."""
-        def importance(obj):
+        def importance(item):
+            obj = item[0]
             pos = obj["pose"]["position"]
-            dist_to_center = math.sqrt(pos["x"]**2 + pos["y"]**2)
+            x = pos["x"]
+            y = pos["y"]
+            dist_sq = x * x + y * y
 
             # Higher score = more important
-            score = 100 - dist_to_center
+            score = 100 - sqrt(dist_sq)
 
             # Boost if in spotlight zone
-            if dist_to_center < SPOTLIGHT_ZONE_RADIUS:
+            if dist_sq < zone_sq:
                 score += 50
 
             # Boost pedestrians/cyclists (more interesting)
-            if obj.get("class") in ["pedestrian", "cyclist"]:
+            if obj.get("class") in boosted:
                 score += 20
 
             return score
 
-        ranked = sorted(objects, key=importance, reverse=True)
-        return ranked[:MAX_OBJECTS_VISIBLE]
+        # Same result as sorted(..., reverse=True)[:N] without sorting everything
+        return heapq.nlargest(MAX_OBJECTS_VISIBLE, items, key=importance)
 
     def draw_causality_arrow(self, canvas: np.ndarray, from_pos: Tuple[int, int],
                               to_pos: Tuple[int, int], label: str, progress: float):
@@ -359,17 +511,14 @@ class DemoRenderer:
         mx, my = (fx + tx) // 2, (fy + ty) // 2
         cv2.putText(canvas, label, (mx - 80, my - 10), FONT, 0.4, COLOR_WHITE, 1)
 
-    def render_world_pane(self, fd: FrameData) -> np.ndarray:
-        canvas = np.full((WORLD_PANE_H, WORLD_PANE_W, 3), BG_COLOR, dtype=np.uint8)
-        self.draw_grid(canvas)
+    def render_world_pane(self, canvas: np.ndarray, fd: FrameData):
+        # Grid and occluder
+        np.copyto(canvas, self._world_bg)
 
         phase = fd.phase
         beat = fd.beat
         spotlight = fd.beat_info.get("spotlight", [])
 
-        # Draw occluder
-        self.draw_occluder(canvas, fd.occluder)
-
         # During occlusion beat, show truth silhouette
         if beat == "occlusion" and phase == "before":
             # Show faint pedestrian position
@@ -378,44 +527,47 @@ class DemoRenderer:
             cv2.circle(canvas, (sx, sy), 10, (40, 40, 40), 2)
             cv2.putText(canvas, "OCCLUDED", (sx - 30, sy - 15), FONT, 0.35, (60, 60, 60), 1)
 
-        # Collect and rank objects to display
-        if phase in ["after", "montage", "close"]:
+        # Collect and rank (object, sender, signature_valid) entries to display
+        show_all = phase in ["after", "montage", "close"]
+        if show_all:
             # Show canonical objects
-            objects_to_draw = self.rank_objects(fd.canonical_objects, spotlight)
+            ranked = self.rank_objects(((obj, "", True) for obj in fd.canonical_objects), spotlight)
             color = COLOR_AFTER
             thickness = 3
         else:
-            # Show raw detections
-            all_detections = []
-            for pkt in fd.packets:
-                for obj in pkt["objects"]:
-                    obj["_agent"] = pkt["agent_id"]
-                    obj["_valid"] = pkt["signature_valid"]
-                    all_detections.append(obj)
-            objects_to_draw = self.rank_objects(all_detections, spotlight)[:MAX_OBJECTS_VISIBLE]
+            # Show raw detections; the sender travels alongside each object
+            # instead of being written into the shared packet dicts
+            ranked = self.rank_objects(((obj, pkt["agent_id"], pkt["signature_valid"])
+                                        for pkt in fd.packets for obj in pkt["objects"]), spotlight)
             color = COLOR_BEFORE
             thickness = 2
 
-        # Draw objects
-        for obj in objects_to_draw:
-            obj_id = obj.get("canonical_object_id", obj.get("local_object_id", ""))
-            agent = obj.get("_agent", "")
+        # Draw objects: all boxes (batched by colour), then labels, then covariances
+        centers, outlines = self.object_outlines([item[0] for item in ranked])
+        colors: List[Tuple[int, int, int]] = []
+        labels: List[str] = []
+        with_cov: List[int] = []
+        for i, (obj, agent, valid) in enumerate(ranked):
             is_spotlight_agent = agent in spotlight
 
             # Determine color
-            if not obj.get("_valid", True):
-                draw_color = COLOR_SPOOF
-                label = "SPOOF"
-            elif is_spotlight_agent or phase in ["after", "montage", "close"]:
-                draw_color = color
-                label = obj.get("class", "")[:3].upper()
+            if not valid:
+                colors.append(COLOR_SPOOF)
+                labels.append("SPOOF")
+            elif is_spotlight_agent or show_all:
+                colors.append(color)
+                labels.append(obj.get("class", "")[:3].upper())
             else:
-                draw_color = COLOR_DIM
-                label = ""
+                colors.append(COLOR_DIM)
+                labels.append("")
 
-            self.draw_object_box(canvas, obj, draw_color, thickness, label)
-            if is_spotlight_agent or phase in ["after", "montage", "close"]:
-                self.draw_covariance(canvas, obj, draw_color)
+            if is_spotlight_agent or show_all:
+                with_cov.append(i)
+
+        self.draw_object_boxes(canvas, centers, outlines, colors, thickness, labels)
+        draw_cov = self.draw_covariance
+        for i in with_cov:
+            draw_cov(canvas, centers[i], ranked[i][0], colors[i])
 
         # Draw agents as small icons
         for pkt in fd.packets:
@@ -430,44 +582,16 @@ class DemoRenderer:
         cv2.putText(canvas, phase_label, (20, 30), FONT, 0.6, COLOR_WHITE, 1)
 
         # Draw 3D inset placeholder
-        cv2.rectangle(canvas, (INSET_X, INSET_Y), (INSET_X + INSET_W, INSET_Y + INSET_H), (30, 30, 30), -1)
-        cv2.rectangle(canvas, (INSET_X, INSET_Y), (INSET_X + INSET_W, INSET_Y + INSET_H), (60, 60, 60), 2)
-        cv2.putText(canvas, "3D INSET (local sensors)", (INSET_X + 10, INSET_Y + 20), FONT, 0.4, (80, 80, 80), 1)
-        cv2.putText(canvas, "LiDAR stays local", (INSET_X + 30, INSET_Y + INSET_H // 2), FONT, 0.5, (100, 100, 100), 1)
-
-        return canvas
-
-    def render_network_pane(self, fd: FrameData) -> np.ndarray:
-        canvas = np.full((NETWORK_PANE_H, NETWORK_PANE_W, 3), BG_COLOR, dtype=np.uint8)
+        np.copyto(canvas[self._inset_region], self._inset_patch, where=self._inset_mask)
 
+    def render_network_pane(self, canvas: np.ndarray, fd: FrameData):
         phase = fd.phase
         spotlight = fd.beat_info.get("spotlight", [])
+        active = phase in ["after", "montage", "close"]
+        shield = fd.beat == "trust_reject" and phase in ["after", "montage"]
 
-        # Draw connections
-        for agent_id, pos in self.agent_positions.items():
-            if agent_id != "unknown_x":
-                cv2.line(canvas, pos, NETWORK_CENTER, GRID_COLOR, 1)
-
-        # Draw nodes
-        for agent_id, pos in self.agent_positions.items():
-            is_spotlight = agent_id in spotlight
-            is_spoof = agent_id == "unknown_x"
-
-            if is_spoof:
-                color = COLOR_SPOOF
-            elif is_spotlight:
-                color = COLOR_AFTER if phase in ["after", "montage", "close"] else COLOR_BEFORE
-            else:
-                color = COLOR_DIM
-
-            radius = NODE_RADIUS + 4 if is_spotlight else NODE_RADIUS
-            cv2.circle(canvas, pos, radius, color, -1 if is_spotlight else 2)
-
-            if is_spotlight:
-                label = agent_id.replace("agent_", "A").replace("drone_", "D")[:3]
-                cv2.putText(canvas, label, (pos[0] - 8, pos[1] + 25), FONT, 0.35, color, 1)
-
-        # Draw packets in flight
+        # Packets in flight
+        dots = []
         for pkt in fd.packets:
             src_id = pkt["agent_id"]
             if src_id not in self.agent_positions:
@@ -482,72 +606,80 @@ class DemoRenderer:
                 py = int(src_pos[1] + (NETWORK_CENTER[1] - src_pos[1]) * progress)
 
                 dot_color = COLOR_SPOOF if not pkt["signature_valid"] else COLOR_CYAN
-                cv2.circle(canvas, (px, py), 5, dot_color, -1)
-
-        # Event visualization: Trust reject shield
-        if fd.beat == "trust_reject" and phase in ["after", "montage"]:
-            # Draw shield at center
-            cv2.circle(canvas, NETWORK_CENTER, 30, COLOR_AFTER, 3)
-            cv2.putText(canvas, "SHIELD", (NETWORK_CENTER[0] - 25, NETWORK_CENTER[1] + 50),
-                        FONT, 0.4, COLOR_AFTER, 1)
+                dots.append(((px, py), dot_color))
 
-        # Title
-        cv2.putText(canvas, "NETWORK", (10, 25), FONT, 0.5, COLOR_WHITE, 1)
+        # The pane rarely changes between frames; reuse the last one when its inputs match
+        key = (active, shield, tuple(spotlight), tuple(dots))
+        if key == self._network_key:
+            np.copyto(canvas, self._network_last)
+            return
 
-        return canvas
+        # Connections and title
+        np.copyto(canvas, self._network_bg)
 
-    def render_data_pane(self, fd: FrameData) -> np.ndarray:
-        canvas = np.full((DATA_PANE_H, DATA_PANE_W, 3), BG_COLOR, dtype=np.uint8)
+        # Spotlight nodes (the others are rings in the background)
+        for agent_id, pos in self.agent_positions.items():
+            if agent_id not in spotlight:
+                continue
 
-        # Title
-        cv2.putText(canvas, "SHARED vs NOT SHARED", (10, 25), FONT, 0.5, COLOR_WHITE, 1)
+            if agent_id == "unknown_x":
+                color = COLOR_SPOOF
+            else:
+                color = COLOR_AFTER if active else COLOR_BEFORE
 
-        # Shared section
-        y = 60
-        cv2.putText(canvas, "SHARED:", (20, y), FONT, 0.5, COLOR_AFTER, 1)
-        y += 28
-        shared = ["class (car, ped...)", "pose (x, y, z, yaw)", "covariance (2x2)",
-                  "timestamp", "signature"]
-        for field in shared:
-            cv2.putText(canvas, f"  [check] {field}", (20, y), FONT, 0.4, COLOR_AFTER, 1)
-            y += 22
+            cv2.circle(canvas, pos, NODE_RADIUS + 4, color, -1)
+            label = agent_id.replace("agent_", "A").replace("drone_", "D")[:3]
+            cv2.putText(canvas, label, (pos[0] - 8, pos[1] + 25), FONT, 0.35, color, 1)
 
-        # Not shared
-        y += 20
-        cv2.putText(canvas, "NOT SHARED:", (20, y), FONT, 0.5, COLOR_BEFORE, 1)
-        y += 28
-        not_shared = ["camera frames", "LiDAR point cloud", "video stream"]
-        for field in not_shared:
-            cv2.putText(canvas, f"  [X] {field}", (20, y), FONT, 0.4, COLOR_BEFORE, 1)
-            y += 22
+        for pos, dot_color in dots:
+            cv2.circle(canvas, pos, 5, dot_color, -1)
 
-        # Event log
-        y += 30
-        cv2.putText(canvas, "EVENTS:", (20, y), FONT, 0.5, COLOR_WHITE, 1)
-        y += 25
+        # Event visualization: Trust reject shield
+        if shield:
+            # Draw shield at center
+            cv2.circle(canvas, NETWORK_CENTER, 30, COLOR_AFTER, 3)
+            cv2.putText(canvas, "SHIELD", (NETWORK_CENTER[0] - 25, NETWORK_CENTER[1] + 50),
+                        FONT, 0.4, COLOR_AFTER, 1)
 
-        for evt in fd.events:
-            self.recent_events.append((fd.frame, evt["event_type"]))
-        self.recent_events = self.recent_events[-4:]
+        self._network_key = key
+        np.copyto(self._network_last, canvas)
 
-        for evt_frame, evt_type in self.recent_events:
+    def render_data_pane(self, canvas: np.ndarray, fd: FrameData):
+        # Last few events so far; derived from the frame alone, so frames
+        # can be rendered in any order
+        log = []
+        for evt in fd.all_events_up_to_now[-4:]:
+            evt_frame, evt_type = evt["frame"], evt["event_type"]
             age = fd.frame - evt_frame
             alpha = max(0.3, 1.0 - age / 60.0)
-            color = tuple(int(c * alpha) for c in COLOR_YELLOW)
+            log.append((evt_type, tuple(int(c * alpha) for c in COLOR_YELLOW)))
+        spotlight = fd.beat_info.get("spotlight", [])[:3]
+
+        # Only the event fade and the spotlight change; reuse the last pane otherwise
+        key = (tuple(log), tuple(spotlight))
+        if key == self._data_key:
+            np.copyto(canvas, self._data_last)
+            return
+
+        # Shared / not shared lists and the event log header
+        np.copyto(canvas, self._data_bg)
+        y = self._data_log_y
+
+        for evt_type, color in log:
             cv2.putText(canvas, f"  {evt_type}", (20, y), FONT, 0.4, color, 1)
             y += 20
 
         # Agent spotlight panel
         y += 30
-        spotlight = fd.beat_info.get("spotlight", [])
         if spotlight:
             cv2.putText(canvas, "SPOTLIGHT:", (20, y), FONT, 0.45, COLOR_CYAN, 1)
             y += 22
-            for agent in spotlight[:3]:
+            for agent in spotlight:
                 cv2.putText(canvas, f"  {agent}", (20, y), FONT, 0.35, COLOR_CYAN, 1)
                 y += 18
 
-        return canvas
+        self._data_key = key
+        np.copyto(self._data_last, canvas)
 
     def render_caption(self, canvas: np.ndarray, fd: FrameData):
         caption = CAPTIONS.get(fd.beat, "")
@@ -569,9 +701,11 @@ class DemoRenderer:
 
         mid = WIDTH // 2
 
-        # Draw BEFORE on left
-        before_scaled = cv2.resize(before_canvas, (mid, HEIGHT))
-        canvas[:, :mid] = before_scaled
+        # Draw BEFORE on left. Only its world pane has content (the rest is
+        # background), so scale just that and fill the remainder
+        scaled_w = WORLD_PANE_W * mid // WIDTH
+        canvas[:, :scaled_w] = cv2.resize(before_canvas, (scaled_w, HEIGHT))
+        canvas[:, scaled_w:mid] = BG_COLOR
 
         # Red banner
         cv2.rectangle(canvas, (0, 0), (mid, 50), COLOR_BEFORE, -1)
@@ -585,37 +719,27 @@ class DemoRenderer:
         cv2.line(canvas, (mid, 0), (mid, HEIGHT), COLOR_WHITE, 3)
 
     def render_before_snapshot(self, fd: FrameData) -> np.ndarray:
-        """Render a BEFORE version for split-screen."""
-        # Create a simple before version
-        canvas = np.full((HEIGHT, WIDTH, 3), BG_COLOR, dtype=np.uint8)
-
+        """Render a BEFORE version of the world pane for split-screen."""
         # Simplified world pane for BEFORE
-        world = np.full((WORLD_PANE_H, WORLD_PANE_W, 3), BG_COLOR, dtype=np.uint8)
-        self.draw_grid(world)
-        self.draw_occluder(world, fd.occluder)
+        world = self._before
+        np.copyto(world, self._world_bg)
 
         # Show chaos: more boxes, jitter
-        for pkt in fd.packets[:5]:
-            for obj in pkt["objects"][:3]:
-                self.draw_object_box(world, obj, COLOR_BEFORE, 2, "?")
-
-        canvas[:WORLD_PANE_H, :WORLD_PANE_W] = world
-        return canvas
+        chaos = [obj for pkt in fd.packets[:5] for obj in pkt["objects"][:3]]
+        centers, outlines = self.object_outlines(chaos)
+        self.draw_object_boxes(world, centers, outlines, [COLOR_BEFORE] * len(chaos), 2,
+                               ["?"] * len(chaos))
+        return world
 
     def render_frame(self, frame: int) -> np.ndarray:
+        """Render one frame. The returned array is reused by the next call."""
         fd = self.data.get_frame_data(frame)
 
-        canvas = np.full((HEIGHT, WIDTH, 3), BG_COLOR, dtype=np.uint8)
-
-        # Render panes
-        world_pane = self.render_world_pane(fd)
-        network_pane = self.render_network_pane(fd)
-        data_pane = self.render_data_pane(fd)
-
-        # Compose
-        canvas[:WORLD_PANE_H, :WORLD_PANE_W] = world_pane
-        canvas[:NETWORK_PANE_H, WORLD_PANE_W:] = network_pane
-        canvas[NETWORK_PANE_H:, WORLD_PANE_W:] = data_pane[:HEIGHT - NETWORK_PANE_H, :]
+        # Render panes in place
+        canvas = self._canvas
+        self.render_world_pane(canvas[:WORLD_PANE_H, :WORLD_PANE_W], fd)
+        self.render_network_pane(canvas[:NETWORK_PANE_H, WORLD_PANE_W:], fd)
+        self.render_data_pane(canvas[NETWORK_PANE_H:, WORLD_PANE_W:], fd)
 
         # Pane borders
         cv2.line(canvas, (WORLD_PANE_W, 0), (WORLD_PANE_W, HEIGHT), PANE_BORDER, 2)
@@ -639,35 +763,139 @@ class DemoRenderer:
 # MAIN
 # =============================================================================
 
+# Renderer used by render_and_write in each pool worker
+_worker_renderer: Optional[DemoRenderer] = None
+
+
+def _init_worker(out_dir: Path, fps: int):
+    """Pool initializer: forked workers inherit the parent's renderer, spawned ones load their own."""
+    global _worker_renderer
+    if _worker_renderer is None:
+        _worker_renderer = DemoRenderer(DataLoader(out_dir, fps), fps)
+
+
+def render_and_write(frame: int, frames_dir: Path) -> int:
+    img = _worker_renderer.render_frame(frame)
+    cv2.imwrite(str(frames_dir / f"frame_{frame:05d}.png"), img)
+    return frame
+
+
+def render_write_behind(frames: Iterable[int], frames_dir: Path,
+                        max_pending: int = 4) -> Iterator[int]:
+    """In-process render_and_write that encodes PNGs on background threads.
+
+    cv2.imwrite releases the GIL, so the next frame renders while earlier ones
+    are compressed. At most max_pending frames wait to be written; beyond that
+    rendering blocks until the writers catch up.
+    """
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=2) as writer:
+        for frame in frames:
+            # render_frame reuses its buffer, so hand the writer a copy
+            img = _worker_renderer.render_frame(frame).copy()
+            path = str(frames_dir / f"frame_{frame:05d}.png")
+            pending.append((frame, writer.submit(cv2.imwrite, path, img)))
+            if len(pending) > max_pending:
+                done, future = pending.popleft()
+                future.result()
+                yield done
+        while pending:
+            done, future = pending.popleft()
+            future.result()
+            yield done
+
+
+def render_raw(frame: int) -> bytes:
+    return _worker_renderer.render_frame(frame).tobytes()
+
+
+def open_encoder(video_path: Path, fps: int, crf: int) -> subprocess.Popen:
+    """Start ffmpeg reading raw BGR frames on stdin (same settings as encode_video.py)."""
+    cmd = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-f", "rawvideo",
+        "-pix_fmt", "bgr24",
+        "-s", f"{WIDTH}x{HEIGHT}",
+        "-r", str(fps),
+        "-i", "-",
+        "-c:v", "libx264",
+        "-crf", str(crf),
+        "-pix_fmt", "yuv420p",
+        "-preset", "medium",
+        str(video_path),
+    ]
+    return subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+
 def main():
+    global _worker_renderer
     parser = argparse.ArgumentParser(description="GodView Demo Fix - Frame Renderer")
     parser.add_argument("--out", type=str, default="./out", help="Output directory")
     parser.add_argument("--fps", type=int, default=30, help="FPS")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Render processes (1 renders in this process)")
+    parser.add_argument("--png", action="store_true",
+                        help="Write out/frames/frame_XXXXX.png instead of piping to ffmpeg")
+    parser.add_argument("--crf", type=int, default=18, help="CRF quality (video output)")
     args = parser.parse_args()
 
     out_dir = Path(args.out)
     frames_dir = out_dir / "frames"
-    frames_dir.mkdir(parents=True, exist_ok=True)
+    video_path = out_dir / "final_godview_demo_fixed.mp4"
 
     print("=" * 60)
     print("GodView Demo Fix - Frame Renderer")
     print("=" * 60)
 
     data = DataLoader(out_dir, args.fps)
-    renderer = DemoRenderer(data, args.fps)
+    _worker_renderer = DemoRenderer(data, args.fps)
 
     total_frames = data.max_frame + 1
-    print(f"Rendering {total_frames} frames...")
-
-    for frame in range(total_frames):
-        img = renderer.render_frame(frame)
-        path = frames_dir / f"frame_{frame:05d}.png"
-        cv2.imwrite(str(path), img)
-
+    print(f"Rendering {total_frames} frames with {args.workers} worker(s)...")
+
+    encoder = None
+    if args.png:
+        frames_dir.mkdir(parents=True, exist_ok=True)
+        render = partial(render_and_write, frames_dir=frames_dir)
+    else:
+        # Stream frames straight into the encoder, skipping PNG compression and disk I/O
+        render = render_raw
+        try:
+            encoder = open_encoder(video_path, args.fps, args.crf)
+        except FileNotFoundError:
+            print("ERROR: ffmpeg not found (install it or use --png)")
+            sys.exit(1)
+
+    if args.workers > 1:
+        # Frames are independent, so each worker renders (and in --png mode encodes) its own;
+        # map() yields results in frame order, which the video pipe relies on
+        pool = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                   initargs=(out_dir, args.fps))
+        done = pool.map(render, range(total_frames), chunksize=8)
+    elif args.png:
+        pool = None
+        done = render_write_behind(range(total_frames), frames_dir)
+    else:
+        pool = None
+        done = map(render, range(total_frames))
+
+    for frame, result in enumerate(done):
+        if encoder is not None:
+            encoder.stdin.write(result)
         if frame % (args.fps * 5) == 0:
             print(f"  Frame {frame}/{total_frames} ({frame/args.fps:.0f}s)")
-
-    print(f"Rendered {total_frames} frames to {frames_dir}")
+    if pool is not None:
+        pool.shutdown()
+
+    if encoder is None:
+        print(f"Rendered {total_frames} frames to {frames_dir}")
+        return
+
+    encoder.stdin.close()
+    if encoder.wait() != 0:
+        print(f"ERROR: ffmpeg failed with code {encoder.returncode}")
+        sys.exit(encoder.returncode)
+    print(f"Rendered {total_frames} frames to {video_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Numba-compiled overlay primitives for the GodView live demo.
+
+Draws batches of box outlines and line segments straight into a uint8
+HxWx3 frame buffer, replacing one OpenCV call per shape with a single
+compiled loop per batch. Used by godview_live_demo.py when Numba is
+installed; otherwise the demo keeps drawing with cv2.polylines.
+
+The functions are also importable without Numba (they run as plain
+Python), but that path is only meant for debugging.
+"""
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
+
+    prange = range
+
+
+@njit(cache=True, nogil=True)
+def _fill_rect(frame, x0, y0, x1, y1, color):
+    """Fill the clipped pixel span [x0, x1) x [y0, y1) with color."""
+    h, w = frame.shape[0], frame.shape[1]
+    x0 = max(x0, 0)
+    y0 = max(y0, 0)
+    x1 = min(x1, w)
+    y1 = min(y1, h)
+    for y in range(y0, y1):
+        for x in range(x0, x1):
+            frame[y, x, 0] = color[0]
+            frame[y, x, 1] = color[1]
+            frame[y, x, 2] = color[2]
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def draw_rects_batch(frame, xy, half, color, thickness=2):
+    """Draw square outlines of half-size `half` centred on each xy row.
+
+    frame: uint8 (H, W, 3); xy: int32 (M, 2) screen centres;
+    color: uint8 (3,) BGR. Edges are `thickness` pixels wide.
+    """
+    lo = thickness // 2
+    for i in prange(xy.shape[0]):
+        cx = xy[i, 0]
+        cy = xy[i, 1]
+        left = cx - half - lo
+        right = cx + half - lo + thickness
+        top = cy - half - lo
+        bottom = cy + half - lo + thickness
+        _fill_rect(frame, left, top, right, top + thickness, color)
+        _fill_rect(frame, left, bottom - thickness, right, bottom, color)
+        _fill_rect(frame, left, top, left + thickness, bottom, color)
+        _fill_rect(frame, right - thickness, top, right, bottom, color)
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def draw_lines_batch(frame, p0, p1, color, thickness=2):
+    """Draw line segments p0[i] -> p1[i] with Bresenham and a square brush.
+
+    frame: uint8 (H, W, 3); p0, p1: int32 (M, 2) screen points;
+    color: uint8 (3,) BGR.
+    """
+    lo = thickness // 2
+    for i in prange(p0.shape[0]):
+        x = p0[i, 0]
+        y = p0[i, 1]
+        x_end = p1[i, 0]
+        y_end = p1[i, 1]
+        dx = abs(x_end - x)
+        dy = -abs(y_end - y)
+        sx = 1 if x < x_end else -1
+        sy = 1 if y < y_end else -1
+        err = dx + dy
+        while True:
+            _fill_rect(frame, x - lo, y - lo, x - lo + thickness, y - lo + thickness, color)
+            if x == x_end and y == y_end:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x += sx
+            if e2 <= dx:
+                err += dx
+                y += sy
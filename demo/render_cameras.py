@@ -20,25 +20,42 @@ import time
 import queue
 import argparse
 import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Configuration
 FRAMES_BASE_PATH = "/workspace/godview_demo/frames"
 CAMERA_WIDTH = 1920
 CAMERA_HEIGHT = 1080
 CAMERA_FOV = 90.0
+SAVE_WORKERS = 4         # Threads encoding frames to disk
+MAX_PENDING_SAVES = 16   # Frames waiting to be saved before the sim waits
+
+# Frame file formats and their cv2.imwrite parameters. Frames end up in an
+# x264 encode, so lossless PNG is mostly wasted deflate time; PPM is raw
+# (lossless, no compression at all) if disk space is not a concern.
+FRAME_FORMATS = {
+    "jpg": [cv2.IMWRITE_JPEG_QUALITY, 95],
+    "png": [],
+    "ppm": [],
+}
 
 
 class LiveCameraRenderer:
     """Renders frames from CARLA during live simulation."""
     
-    def __init__(self, client, world, output_dir):
+    def __init__(self, client, world, output_dir, frame_format="jpg"):
         self.client = client
         self.world = world
         self.output_dir = output_dir
+        self.frame_format = frame_format
+        self.save_params = FRAME_FORMATS[frame_format]
         self.cameras = {}
         self.image_queues = {}
         self.vehicles = []
         self.hero_vehicle = None
+        # cv2.imwrite releases the GIL, so frame encoding overlaps world ticks
+        self.save_pool = ThreadPoolExecutor(max_workers=SAVE_WORKERS)
         
         os.makedirs(output_dir, exist_ok=True)
     
@@ -114,9 +131,9 @@ class LiveCameraRenderer:
         """Convert CARLA image to file."""
         array = np.frombuffer(image.raw_data, dtype=np.uint8)
         array = array.reshape((CAMERA_HEIGHT, CAMERA_WIDTH, 4))
-        array = array[:, :, :3]  # Remove alpha
-        array = array[:, :, ::-1]  # BGRA to RGB for cv2
-        cv2.imwrite(output_path, array)
+        # CARLA delivers BGRA, which is already cv2's channel order: just drop
+        # alpha, in one SIMD pass to a contiguous buffer the encoder can use as is
+        cv2.imwrite(output_path, cv2.cvtColor(array, cv2.COLOR_BGRA2BGR), self.save_params)
     
     def capture_frames(self, num_frames=300, camera_name="ego"):
         """Capture frames from specified camera during simulation."""
@@ -128,6 +145,7 @@ class LiveCameraRenderer:
         os.makedirs(output_dir, exist_ok=True)
         
         img_queue = self.image_queues[camera_name]
+        pending = deque()
         captured = 0
         start_time = time.time()
         
@@ -138,8 +156,10 @@ class LiveCameraRenderer:
             
             try:
                 image = img_queue.get(timeout=2.0)
-                frame_path = os.path.join(output_dir, f"{camera_name}_{frame:04d}.png")
-                self.save_frame(image, frame_path)
+                frame_path = os.path.join(output_dir, f"{camera_name}_{frame:04d}.{self.frame_format}")
+                pending.append(self.save_pool.submit(self.save_frame, image, frame_path))
+                if len(pending) > MAX_PENDING_SAVES:
+                    pending.popleft().result()  # Encoder fell behind; wait for the oldest
                 captured += 1
                 
                 if frame % 50 == 0:
@@ -150,11 +170,16 @@ class LiveCameraRenderer:
             except queue.Empty:
                 print(f"    Warning: No image at frame {frame}")
         
+        while pending:
+            pending.popleft().result()
+        
         print(f"[CAPTURE] Saved {captured} frames to {output_dir}")
         return captured
     
     def cleanup(self):
         """Destroy cameras and vehicles."""
+        self.save_pool.shutdown()
+        
         for name, camera in self.cameras.items():
             camera.stop()
             camera.destroy()
@@ -176,6 +201,8 @@ def main():
     parser.add_argument("--camera", default="ego", choices=["ego", "overhead", "all"],
                         help="Which camera to use")
     parser.add_argument("--output", default=FRAMES_BASE_PATH, help="Output directory")
+    parser.add_argument("--format", default="jpg", choices=sorted(FRAME_FORMATS),
+                        help="Frame file format (png is lossless but slow to encode)")
     args = parser.parse_args()
     
     print("=" * 60)
@@ -189,7 +216,7 @@ def main():
     world = client.get_world()
     
     # Create renderer
-    renderer = LiveCameraRenderer(client, world, args.output)
+    renderer = LiveCameraRenderer(client, world, args.output, args.format)
     
     try:
         print("[2/5] Configuring world...")
@@ -11,6 +11,7 @@ Updated for V2 requirements:
 """
 
 import carla
+import numpy as np
 import random
 import time
 import json
@@ -46,6 +47,16 @@ SYBIL_ACTIVE = True   # Include Sybil attack object
 # Drone altitude
 DRONE_ALTITUDE = 25.0
 
+# Phase frame ranges (match overlay_renderer.py)
+SETUP_FRAMES = (0, 450)           # 0-15s
+ACTIVATION_FRAMES = (1351, 1650)  # 45-55s
+TRUST_REJECT_FRAME = 1400
+PANCAKE_FIXED_FRAME = 1700
+
+# Field order of the per-vehicle pose/velocity arrays
+POSE_KEYS = ('x', 'y', 'z', 'yaw', 'pitch', 'roll')
+VEL_KEYS = ('x', 'y', 'z')
+
 # Output files
 OUTPUT_DIR = Path(__file__).parent / "data"
 
@@ -156,14 +167,50 @@ def build_merge_event(
     }
 
 
+def make_drone_pose(z: float):
+    """Build a pose reader for drones reported at the fixed altitude z."""
+    def drone_pose(transform) -> dict:
+        loc = transform.location
+        rot = transform.rotation
+        return {
+            'x': loc.x,
+            'y': loc.y,
+            'z': z,
+            'yaw': rot.yaw,
+            'pitch': rot.pitch,
+            'roll': rot.roll
+        }
+    return drone_pose
+
+
+def build_event_schedule() -> Dict[int, tuple]:
+    """Precompute which MERGE_EVENT codes fire on which frame."""
+    schedule = {}
+    for frame_idx in range(ACTIVATION_FRAMES[0], ACTIVATION_FRAMES[1] + 1):
+        codes = []
+        if frame_idx % 30 == 0:  # Ghost merges every second
+            codes.append("ID_MERGE")
+        if frame_idx == TRUST_REJECT_FRAME and SYBIL_ACTIVE:  # Once at start of activation
+            codes.append("TRUST_REJECT")
+        if frame_idx % 15 == 0:
+            codes.append("OOSM_CORRECTED")
+        if codes:
+            schedule[frame_idx] = tuple(codes)
+    # Drone altitude fixes during solution phase
+    schedule[PANCAKE_FIXED_FRAME] = schedule.get(PANCAKE_FIXED_FRAME, ()) + ("PANCAKE_FIXED",)
+    return schedule
+
+
 # ============================================================================
 # SCENARIO RUNNER
 # ============================================================================
 
 class ScenarioRunner:
-    def __init__(self, client: carla.Client, world: carla.World):
+    def __init__(self, client: carla.Client, world: carla.World, offscreen: bool = False):
         self.client = client
         self.world = world
+        self.offscreen = offscreen  # Skip server-side rendering (logs only)
+        self.original_no_rendering = None  # Server setting to restore in cleanup
         self.blueprint_library = world.get_blueprint_library()
         
         # Actors
@@ -171,11 +218,27 @@ class ScenarioRunner:
         self.drones = []  # Actually walkers teleported to altitude
         self.hero_vehicle = None
         
+        # Per-vehicle state (struct-of-arrays, one row per entry in self.vehicles),
+        # refreshed once per tick and shared by the raw and fused generators
+        self.veh_pose = np.zeros((0, 6), dtype=np.float64)  # x, y, z, yaw, pitch, roll
+        self.veh_vel = np.zeros((0, 3), dtype=np.float64)
+        self.veh_alive = np.zeros(0, dtype=bool)
+        self.veh_oosm = np.zeros(0, dtype=bool)
+        self.veh_hero = np.zeros(0, dtype=bool)
+        self.drone_transforms = []  # Per entry in self.drones; None when dead
+        self.rng = np.random.default_rng()
+        
+        # Drone pose readers with the reported altitude baked in
+        self.raw_drone_pose = make_drone_pose(0.5)  # Pancake: force Z to ground level
+        self.fused_drone_pose = make_drone_pose(DRONE_ALTITUDE)
+        
         # Tracking
         self.oosm_actors = set()
         self.ghost_actors = {}  # actor_id -> ghost offset
         self.sybil_position = None
         
+        self.bbox_cache = {}  # actor_id -> bbox extent dict
+        
         # State history for OOSM simulation
         self.position_history = {}  # actor_id -> list of positions
         
@@ -185,6 +248,9 @@ class ScenarioRunner:
         self.fused_file = open(OUTPUT_DIR / "godview_merged.ndjson", 'w')
         self.events_file = open(OUTPUT_DIR / "merge_events.ndjson", 'w')
         
+        # MERGE_EVENT schedule: frame -> event codes, in emission order
+        self.event_schedule = build_event_schedule()
+        
         # Stats
         self.stats = {
             "ghosts_generated": 0,
@@ -198,6 +264,11 @@ class ScenarioRunner:
         settings = self.world.get_settings()
         settings.synchronous_mode = True
         settings.fixed_delta_seconds = FIXED_DELTA
+        # Nothing is captured from the server view while generating logs;
+        # the replayer renders later from the recording
+        self.original_no_rendering = settings.no_rendering_mode
+        if self.offscreen:
+            settings.no_rendering_mode = True
         self.world.apply_settings(settings)
         
         # Setup Traffic Manager
@@ -206,7 +277,8 @@ class ScenarioRunner:
         tm.set_global_distance_to_leading_vehicle(2.5)
         tm.global_percentage_speed_difference(-20)  # Slightly slower
         
-        print(f"[SETUP] World configured: {FIXED_DELTA}s delta, {FPS} FPS")
+        print(f"[SETUP] World configured: {FIXED_DELTA}s delta, {FPS} FPS"
+              f"{' (no rendering)' if self.offscreen else ''}")
         
         return tm
     
@@ -218,11 +290,15 @@ class ScenarioRunner:
         # Spawn vehicles
         vehicle_bps = self.blueprint_library.filter('vehicle.*')
         safe_bps = [bp for bp in vehicle_bps if int(bp.get_attribute('number_of_wheels')) == 4]
+        # Paint options per blueprint, looked up once instead of per spawn
+        bp_colors = {bp.id: bp.get_attribute('color').recommended_values
+                     for bp in safe_bps if bp.has_attribute('color')}
         
         for i in range(min(NUM_VEHICLES, len(spawn_points))):
             bp = random.choice(safe_bps)
-            if bp.has_attribute('color'):
-                bp.set_attribute('color', random.choice(bp.get_attribute('color').recommended_values))
+            colors = bp_colors.get(bp.id)
+            if colors:
+                bp.set_attribute('color', random.choice(colors))
             
             vehicle = self.world.try_spawn_actor(bp, spawn_points[i])
             if vehicle:
@@ -237,6 +313,13 @@ class ScenarioRunner:
                 if self.hero_vehicle is None:
                     self.hero_vehicle = vehicle
         
+        num = len(self.vehicles)
+        self.veh_pose = np.zeros((num, 6), dtype=np.float64)
+        self.veh_vel = np.zeros((num, 3), dtype=np.float64)
+        self.veh_alive = np.ones(num, dtype=bool)
+        self.veh_oosm = np.array([v.id in self.oosm_actors for v in self.vehicles], dtype=bool)
+        self.veh_hero = np.array([v is self.hero_vehicle for v in self.vehicles], dtype=bool)
+        
         # Spawn drones (walkers teleported to altitude)
         walker_bp = self.blueprint_library.filter('walker.pedestrian.*')[0]
         
@@ -263,107 +346,114 @@ class ScenarioRunner:
         print(f"[SPAWN] {len(self.vehicles)} vehicles, {len(self.drones)} drones")
         print(f"[SPAWN] OOSM actors: {len(self.oosm_actors)}")
     
-    def get_actor_pose(self, actor, add_jitter=False) -> dict:
-        """Get actor pose, optionally with OOSM jitter."""
-        transform = actor.get_transform()
-        loc = transform.location
-        rot = transform.rotation
-        
-        pose = {
-            'x': loc.x,
-            'y': loc.y,
-            'z': loc.z,
-            'yaw': rot.yaw,
-            'pitch': rot.pitch,
-            'roll': rot.roll
-        }
-        
-        if add_jitter and actor.id in self.oosm_actors:
-            # OOSM jitter: random offset simulating stale/out-of-order data
-            pose['x'] += random.gauss(0, 1.2)
-            pose['y'] += random.gauss(0, 1.2)
-            self.stats["oosm_packets"] += 1
-        
-        return pose
+    def refresh_actor_state(self):
+        """Read liveness, poses and velocities for every actor once for this tick.
+        
+        Everything comes from a single world snapshot: actors missing from it
+        are treated as dead, so no per-actor is_alive/get_transform/get_velocity
+        round trips are made.
+        """
+        snapshot = self.world.get_snapshot()
+        
+        for i, vehicle in enumerate(self.vehicles):
+            actor = snapshot.find(vehicle.id)
+            self.veh_alive[i] = actor is not None
+            if actor is None:
+                continue
+            transform = actor.get_transform()
+            loc, rot = transform.location, transform.rotation
+            self.veh_pose[i] = (loc.x, loc.y, loc.z, rot.yaw, rot.pitch, rot.roll)
+            v = actor.get_velocity()
+            self.veh_vel[i] = (v.x, v.y, v.z)
+        
+        # None marks a dead drone
+        self.drone_transforms = []
+        for drone in self.drones:
+            actor = snapshot.find(drone.id)
+            self.drone_transforms.append(None if actor is None else actor.get_transform())
     
     def get_actor_bbox(self, actor) -> dict:
-        """Get actor bounding box extent."""
-        bbox = actor.bounding_box
-        return {
-            'x': bbox.extent.x,
-            'y': bbox.extent.y,
-            'z': bbox.extent.z
-        }
+        """Get actor bounding box extent (cached; extents never change)."""
+        extent = self.bbox_cache.get(actor.id)
+        if extent is None:
+            bbox = actor.bounding_box
+            extent = self.bbox_cache[actor.id] = {
+                'x': bbox.extent.x,
+                'y': bbox.extent.y,
+                'z': bbox.extent.z
+            }
+        return extent
     
     def generate_raw_detections(self, frame_idx: int, timestamp_ns: int):
         """Generate raw (broken) detections with faults."""
         objects = []
         
-        # Vehicles
-        for vehicle in self.vehicles:
-            if not vehicle.is_alive:
-                continue
-            
-            # Raw pose with possible OOSM jitter
-            pose = self.get_actor_pose(vehicle, add_jitter=True)
+        # Vehicles: fault draws for the whole fleet in one vectorized pass
+        n = len(self.vehicles)
+        raw_pose = self.veh_pose.copy()
+        
+        # OOSM jitter: random offset simulating stale/out-of-order data
+        jitter = self.rng.normal(0, 1.2, (n, 2))
+        raw_pose[self.veh_oosm, :2] += jitter[self.veh_oosm]
+        self.stats["oosm_packets"] += int(np.count_nonzero(self.veh_oosm & self.veh_alive))
+        
+        confidence = 0.7 + self.rng.uniform(-0.1, 0.1, n)
+        
+        # Ghost generation (NEVER for hero)
+        ghosts = (self.rng.random(n) < GHOST_RATE) & ~self.veh_hero & self.veh_alive
+        ghost_offset = self.rng.uniform(-3, 3, (n, 2))
+        ghost_conf = 0.4 + self.rng.uniform(0, 0.2, n)
+        
+        # High covariance for raw detections (simulating sensor noise)
+        # Format: [var_x, cov_xy, cov_yx, var_y]
+        raw_cov = [2.5, 0.1, 0.1, 2.5]
+        
+        # Very high covariance for ghosts
+        ghost_cov = [5.0, 0.0, 0.0, 5.0]
+        
+        for i in np.flatnonzero(self.veh_alive):
+            vehicle = self.vehicles[i]
+            pose = dict(zip(POSE_KEYS, raw_pose[i].tolist()))
             bbox = self.get_actor_bbox(vehicle)
             
-            # Is this the hero vehicle?
-            is_hero = (vehicle.id == self.hero_vehicle.id) if self.hero_vehicle else False
-            
-            # Calculate velocity (approximate from physics control or previous state)
-            v = vehicle.get_velocity()
-            velocity = {'x': v.x, 'y': v.y, 'z': v.z}
-            
-            # High covariance for raw detections (simulating sensor noise)
-            # Format: [var_x, cov_xy, cov_yx, var_y]
-            raw_cov = [2.5, 0.1, 0.1, 2.5]
-            
             obj = build_object_detection(
                 local_id=f"vehicle_{vehicle.id}",
                 obj_class="vehicle",
                 pose=pose,
                 bbox_extent=bbox,
-                confidence=0.7 + random.uniform(-0.1, 0.1),
+                confidence=float(confidence[i]),
                 signature=f"sig_{vehicle.id}",
-                is_hero=is_hero,
-                velocity=velocity,
+                is_hero=bool(self.veh_hero[i]),
+                velocity=dict(zip(VEL_KEYS, self.veh_vel[i].tolist())),
                 covariance=raw_cov
             )
             objects.append(obj)
             
-            # Ghost generation (NEVER for hero)
-            if not is_hero and random.random() < GHOST_RATE:
+            if ghosts[i]:
                 ghost_pose = pose.copy()
-                ghost_pose['x'] += random.uniform(-3, 3)
-                ghost_pose['y'] += random.uniform(-3, 3)
-                
-                # Very high covariance for ghosts
-                ghost_cov = [5.0, 0.0, 0.0, 5.0]
+                ghost_pose['x'] += float(ghost_offset[i, 0])
+                ghost_pose['y'] += float(ghost_offset[i, 1])
                 
                 ghost_obj = build_object_detection(
                     local_id=f"ghost_{vehicle.id}_{frame_idx}",
                     obj_class="vehicle",
                     pose=ghost_pose,
                     bbox_extent=bbox,
-                    confidence=0.4 + random.uniform(0, 0.2),
+                    confidence=float(ghost_conf[i]),
                     note="GHOST_DUPLICATE",
                     covariance=ghost_cov
                 )
                 objects.append(ghost_obj)
-                self.stats["ghosts_generated"] += 1
+        self.stats["ghosts_generated"] += int(np.count_nonzero(ghosts))
         
         # Drones (pancaked to ground in raw view)
-        for drone in self.drones:
-            if not drone.is_alive:
+        for drone, transform in zip(self.drones, self.drone_transforms):
+            if transform is None:
                 continue
             
-            pose = self.get_actor_pose(drone)
+            pose = self.raw_drone_pose(transform)
             bbox = self.get_actor_bbox(drone)
             
-            # Pancake: force Z to ground level
-            pose['z'] = 0.5
-            
             # High vertical uncertainty
             drone_cov = [1.0, 0.0, 0.0, 1.0]
             
@@ -380,7 +470,7 @@ class ScenarioRunner:
             objects.append(obj)
         
         # Sybil attack object
-        if SYBIL_ACTIVE and self.sybil_position and frame_idx > 450:  # After setup phase
+        if SYBIL_ACTIVE and self.sybil_position and frame_idx > SETUP_FRAMES[1]:  # After setup phase
             # Sybil has fake velocity
             sybil_vel = {'x': 0, 'y': 0, 'z': 0}
             sybil_cov = [0.1, 0.0, 0.0, 0.1] # Fake high precision
@@ -412,18 +502,15 @@ class ScenarioRunner:
         objects = []
         
         # Vehicles (smooth, no ghosts)
-        for vehicle in self.vehicles:
-            if not vehicle.is_alive:
-                continue
+        for i in np.flatnonzero(self.veh_alive):
+            vehicle = self.vehicles[i]
             
             # Clean pose (no jitter)
-            pose = self.get_actor_pose(vehicle, add_jitter=False)
+            pose = dict(zip(POSE_KEYS, self.veh_pose[i].tolist()))
             bbox = self.get_actor_bbox(vehicle)
             
-            is_hero = (vehicle.id == self.hero_vehicle.id) if self.hero_vehicle else False
-            
-            v = vehicle.get_velocity()
-            velocity = {'x': v.x, 'y': v.y, 'z': v.z}
+            is_hero = bool(self.veh_hero[i])
+            velocity = dict(zip(VEL_KEYS, self.veh_vel[i].tolist()))
             
             # Tight covariance for fused state
             fused_cov = [0.2, 0.0, 0.0, 0.2]
@@ -441,16 +528,13 @@ class ScenarioRunner:
             objects.append(obj)
         
         # Drones (correct altitude)
-        for drone in self.drones:
-            if not drone.is_alive:
+        for drone, transform in zip(self.drones, self.drone_transforms):
+            if transform is None:
                 continue
             
-            pose = self.get_actor_pose(drone)
+            pose = self.fused_drone_pose(transform)  # Correct altitude (not pancaked)
             bbox = self.get_actor_bbox(drone)
             
-            # Correct altitude (not pancaked)
-            pose['z'] = DRONE_ALTITUDE
-            
             obj = build_canonical_object(
                 canonical_id=f"drone_{drone.id}",
                 obj_class="drone",
@@ -473,10 +557,8 @@ class ScenarioRunner:
     
     def generate_merge_events(self, frame_idx: int, timestamp_ns: int):
         """Generate MERGE_EVENT packets at appropriate times."""
-        # Activation phase: frames 1351-1650 (45s-55s)
-        if 1351 <= frame_idx <= 1650:
-            # Ghost merges
-            if frame_idx % 30 == 0:  # Every second
+        for code in self.event_schedule.get(frame_idx, ()):
+            if code == "ID_MERGE":
                 event = build_merge_event(
                     timestamp_ns=timestamp_ns,
                     event_code="ID_MERGE",
@@ -490,8 +572,7 @@ class ScenarioRunner:
                 self.events_file.write(json.dumps(event) + '\n')
                 self.stats["merges"] += 1
             
-            # Trust reject (for Sybil) - once at start of activation
-            if frame_idx == 1400 and SYBIL_ACTIVE:
+            elif code == "TRUST_REJECT":
                 event = build_merge_event(
                     timestamp_ns=timestamp_ns,
                     event_code="TRUST_REJECT",
@@ -503,8 +584,7 @@ class ScenarioRunner:
                 self.events_file.write(json.dumps(event) + '\n')
                 self.stats["trust_rejects"] += 1
             
-            # OOSM correction events
-            if frame_idx % 15 == 0:
+            elif code == "OOSM_CORRECTED":
                 event = build_merge_event(
                     timestamp_ns=timestamp_ns,
                     event_code="OOSM_CORRECTED",
@@ -515,20 +595,19 @@ class ScenarioRunner:
                     }
                 )
                 self.events_file.write(json.dumps(event) + '\n')
-        
-        # Drone altitude fixes during solution phase
-        if frame_idx == 1700:
-            for drone in self.drones:
-                event = build_merge_event(
-                    timestamp_ns=timestamp_ns,
-                    event_code="PANCAKE_FIXED",
-                    details={
-                        "object_id": f"drone_{drone.id}",
-                        "corrected_altitude": DRONE_ALTITUDE,
-                        "method": "h3_voxel_grid"
-                    }
-                )
-                self.events_file.write(json.dumps(event) + '\n')
+            
+            elif code == "PANCAKE_FIXED":
+                for drone in self.drones:
+                    event = build_merge_event(
+                        timestamp_ns=timestamp_ns,
+                        event_code="PANCAKE_FIXED",
+                        details={
+                            "object_id": f"drone_{drone.id}",
+                            "corrected_altitude": DRONE_ALTITUDE,
+                            "method": "h3_voxel_grid"
+                        }
+                    )
+                    self.events_file.write(json.dumps(event) + '\n')
     
     def run(self):
         """Run the scenario and generate all outputs."""
@@ -562,16 +641,20 @@ class ScenarioRunner:
             timestamp_ns = int((frame_idx / FPS) * 1e9)
             
             # Generate data
+            self.refresh_actor_state()
             self.generate_raw_detections(frame_idx, timestamp_ns)
             self.generate_fused_state(frame_idx, timestamp_ns)
             self.generate_merge_events(frame_idx, timestamp_ns)
             
-            # Teleport drones to altitude (keep them hovering)
-            for drone in self.drones:
-                if drone.is_alive:
-                    transform = drone.get_transform()
+            # Teleport drones to altitude (keep them hovering), sent to the
+            # server as one batch instead of one set_transform RPC per drone
+            teleports = []
+            for drone, transform in zip(self.drones, self.drone_transforms):
+                if transform is not None:
                     transform.location.z = DRONE_ALTITUDE
-                    drone.set_transform(transform)
+                    teleports.append(carla.command.ApplyTransform(drone.id, transform))
+            if teleports:
+                self.client.apply_batch(teleports)
             
             # Progress
             if frame_idx % (FPS * 5) == 0:  # Every 5 seconds
@@ -613,6 +696,8 @@ class ScenarioRunner:
         try:
             settings = self.world.get_settings()
             settings.synchronous_mode = False
+            if self.original_no_rendering is not None:
+                settings.no_rendering_mode = self.original_no_rendering
             self.world.apply_settings(settings)
         except RuntimeError:
             pass
@@ -624,6 +709,8 @@ def main():
     parser = argparse.ArgumentParser(description="GodView V2 Scenario Runner")
     parser.add_argument("--host", default="localhost", help="CARLA host")
     parser.add_argument("--port", type=int, default=2000, help="CARLA port")
+    parser.add_argument("--offscreen", action="store_true",
+                        help="Run CARLA in no_rendering_mode (headless log generation)")
     args = parser.parse_args()
     
     print(f"[INIT] Connecting to CARLA at {args.host}:{args.port}")
@@ -633,7 +720,7 @@ def main():
     world = client.get_world()
     print(f"[INIT] Connected to {world.get_map().name}")
     
-    runner = ScenarioRunner(client, world)
+    runner = ScenarioRunner(client, world, offscreen=args.offscreen)
     
     try:
         runner.run()